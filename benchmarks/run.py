@@ -0,0 +1,172 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import time
+import tracemalloc
+import numpy as np
+from engine.config import RunConfig
+from engine.constants import DATASET_PATH
+from engine import processing
+from engine.utils import transform_non_numeric
+from mlp.model import MLPModel
+from mlp.optimizers import SGD
+
+BATCH_SIZES = [32, 128, 512]
+HIDDEN_SIZES = [50, 100, 200]
+FEATURES = 27
+CLASSES = 15
+
+
+def _timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench_processing_stages(use_smote: bool = True, seed: int = 42) -> dict:
+    timings = {}
+    df, timings['read'] = _timed(processing._read_dataset_to_df, DATASET_PATH)
+    df, timings['missing_values'] = _timed(processing._process_missing_values, df)
+    df, timings['impute'] = _timed(processing._impute_missing_values, df)
+    df, timings['add_attributes'] = _timed(processing._add_new_attributes, df, seed)
+    df, timings['duplicates'] = _timed(processing._process_duplicated_values, df)
+    balance = processing._balance_dataset_smote if use_smote else processing._balance_dataset
+    _, timings['balance'] = _timed(balance, df, "Race", seed)
+    _, timings['chunked_read'] = _timed(processing.process_dataset, DATASET_PATH, cache_dir=None, chunksize=1000,
+                                        balance=False)
+    timings['total'] = sum(timings[stage] for stage in
+                           ['read', 'missing_values', 'impute', 'add_attributes', 'duplicates', 'balance'])
+    return timings
+
+
+def bench_throughput(repeats: int = 20, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    results = []
+    for hidden_size in HIDDEN_SIZES:
+        for batch_size in BATCH_SIZES:
+            data = rng.standard_normal((batch_size, FEATURES))
+            labels = rng.integers(0, CLASSES, batch_size)
+            model = MLPModel.from_split(data, data, labels, labels, CLASSES, hidden_size, seed=seed)
+            model.optimizer = SGD(0.0)
+            model.optimizer.setup(model._parameters())
+
+            start = time.perf_counter()
+            for _ in range(repeats):
+                model._forward_propagation(data)
+            forward_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(repeats):
+                model._backward_propagation(labels, model._forward_propagation(data))
+            step_time = time.perf_counter() - start
+
+            results.append({
+                'hidden_size': hidden_size,
+                'batch_size': batch_size,
+                'forward_samples_per_sec': repeats * batch_size / forward_time,
+                'train_step_samples_per_sec': repeats * batch_size / step_time,
+            })
+    return results
+
+
+def bench_convergence(config: RunConfig, target_accuracy: float) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        df, _ = transform_non_numeric(processing.process_dataset(DATASET_PATH, **config.dataset_kwargs()))
+
+    model = MLPModel(df, **config.model_kwargs())
+    _, train_time = _timed(model.train, config.batch_size, save_path=None, show_plot=False, verbose=False)
+
+    # tracemalloc slows training down, so peak memory comes from a second, untimed run of the same config.
+    traced = MLPModel(df, **config.model_kwargs())
+    tracemalloc.start()
+    _timed(traced.train, config.batch_size, save_path=None, show_plot=False, verbose=False)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    reached = [epoch for epoch, accuracy in zip(model.history['eval_epochs'], model.accuracies)
+               if accuracy >= target_accuracy]
+    return {
+        'target_accuracy': target_accuracy,
+        'epochs_to_target': reached[0] if reached else None,
+        'epochs_run': model.epochs_run,
+        'best_accuracy': model.best_accuracy,
+        'train_time': train_time,
+        'seconds_per_epoch': train_time / max(model.epochs_run, 1),
+        'peak_traced_memory_bytes': peak_memory,
+    }
+
+
+def _flatten(results, prefix='') -> dict:
+    if isinstance(results, dict):
+        items = results.items()
+    elif isinstance(results, list):
+        items = ((f"{row.get('hidden_size')}x{row.get('batch_size')}", row) for row in results)
+    else:
+        return {prefix: results}
+    flat = {}
+    for key, value in items:
+        if key in ('hidden_size', 'batch_size', 'target_accuracy'):
+            continue
+        flat.update(_flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    return flat
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.1) -> list[str]:
+    """
+    Lists metrics that moved more than `tolerance` in the wrong direction: throughput and accuracy should not
+    drop, times, epochs and memory should not grow.
+    """
+    current, previous = _flatten(results['benchmarks']), _flatten(baseline['benchmarks'])
+    regressions = []
+    for key, value in current.items():
+        old = previous.get(key)
+        if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+            continue
+        higher_is_better = 'per_sec' in key or 'accuracy' in key
+        change = (value - old) / old
+        if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+            regressions.append(f"{key}: {old:.4g} -> {value:.4g} ({change * 100:+.1f}%)")
+    return regressions
+
+
+def run(config: RunConfig, target_accuracy: float) -> dict:
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'cpu_count': os.cpu_count(),
+            'config': config.__dict__,
+        },
+        'benchmarks': {
+            'processing': bench_processing_stages(config.use_smote, config.seed),
+            'throughput': bench_throughput(seed=config.seed),
+            'convergence': bench_convergence(config, target_accuracy),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless training and preprocessing benchmarks.")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against", default=None)
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--target-accuracy", type=float, default=0.4)
+    parser.add_argument("--tolerance", type=float, default=0.1)
+
+    args = parser.parse_args()
+
+    bench_results = run(RunConfig(epochs=args.epochs), args.target_accuracy)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(bench_results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline_results = json.load(f)
+        found = compare(bench_results, baseline_results, args.tolerance)
+        print("\n".join(found) if found else "No regressions against baseline.")
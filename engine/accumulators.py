@@ -0,0 +1,191 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+
+
+class MomentAccumulator:
+    """
+    Running count, mean and co-moment matrix (sum of outer products of deviations) over complete rows of numeric
+    columns. Chunks are folded in with the pairwise form of Welford's update, which is also how two
+    accumulators merge, so the result does not depend on how the rows were split.
+    """
+
+    def __init__(self, columns: list[str]):
+        self.columns = list(columns)
+        self.count = 0
+        self.mean = np.zeros(len(self.columns))
+        self.comoments = np.zeros((len(self.columns), len(self.columns)))
+
+    def update(self, data: np.ndarray):
+        data = np.asarray(data, dtype=np.float64)
+        data = data[~np.isnan(data).any(axis=1)]
+        if len(data) == 0:
+            return
+        mean = data.mean(axis=0)
+        deviations = data - mean
+        self._combine(len(data), mean, deviations.T @ deviations)
+
+    def merge(self, other: "MomentAccumulator"):
+        self._combine(other.count, other.mean, other.comoments)
+
+    def _combine(self, count: int, mean: np.ndarray, comoments: np.ndarray):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.comoments += comoments + np.outer(delta, delta) * (self.count * count / total)
+        self.mean += delta * (count / total)
+        self.count = total
+
+    def variance(self) -> np.ndarray:
+        return np.diag(self.comoments) / max(self.count - 1, 1)
+
+    def correlation(self) -> np.ndarray:
+        scale = np.sqrt(np.diag(self.comoments))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = self.comoments / np.outer(scale, scale)
+        return np.nan_to_num(correlation)
+
+    def state_dict(self) -> dict:
+        return {'columns': self.columns, 'count': self.count, 'mean': self.mean.tolist(),
+                'comoments': self.comoments.tolist()}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "MomentAccumulator":
+        accumulator = cls(state['columns'])
+        accumulator.count = state['count']
+        accumulator.mean = np.array(state['mean'], dtype=np.float64)
+        accumulator.comoments = np.array(state['comoments'], dtype=np.float64)
+        return accumulator
+
+
+class ValueCounter:
+    """Per-column value counts (missing values excluded)."""
+
+    def __init__(self, columns: list[str]):
+        self.columns = list(columns)
+        self.counts = {column: {} for column in self.columns}
+
+    def update(self, df: pd.DataFrame):
+        for column in self.columns:
+            counts = self.counts[column]
+            for value, count in df[column].value_counts().items():
+                if count:
+                    key = value.item() if hasattr(value, 'item') else value
+                    counts[key] = counts.get(key, 0) + int(count)
+
+    def merge(self, other: "ValueCounter"):
+        for column in self.columns:
+            counts = self.counts[column]
+            for value, count in other.counts[column].items():
+                counts[value] = counts.get(value, 0) + count
+
+    def sorted_counts(self, column: str) -> tuple[list, np.ndarray]:
+        values = sorted(self.counts[column], key=lambda value: (isinstance(value, str), value))
+        return values, np.array([self.counts[column][value] for value in values], dtype=np.int64)
+
+    def mode(self, column: str):
+        return max(self.counts[column].items(), key=lambda item: item[1])[0]
+
+    def state_dict(self) -> dict:
+        return {column: [[value, count] for value, count in counts.items()] for column, counts in self.counts.items()}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "ValueCounter":
+        counter = cls(list(state))
+        counter.counts = {column: {value: count for value, count in pairs} for column, pairs in state.items()}
+        return counter
+
+
+def _quantile(values: np.ndarray, counts: np.ndarray, q: float) -> float:
+    # Linear interpolation between order statistics, as in pandas' describe().
+    cumulative = np.cumsum(counts)
+    position = q * (cumulative[-1] - 1)
+    lower = values[np.searchsorted(cumulative, np.floor(position), side='right')]
+    upper = values[np.searchsorted(cumulative, np.ceil(position), side='right')]
+    return float(lower + (upper - lower) * (position - np.floor(position)))
+
+
+class DatasetStatistics:
+    """
+    Mergeable summary of survey rows: value counts for every column and moments of the numeric ones. Feed it
+    chunks with `update`, combine partial results from other chunks or processes with `merge`, and persist it
+    with `save`/`load` so new rows only cost their own pass.
+    """
+
+    def __init__(self, numeric_columns: list[str], categorical_columns: list[str]):
+        self.numeric_columns = list(numeric_columns)
+        self.categorical_columns = list(categorical_columns)
+        self.rows = 0
+        self.moments = MomentAccumulator(self.numeric_columns)
+        self.counter = ValueCounter(self.categorical_columns + self.numeric_columns)
+
+    def update(self, df: pd.DataFrame) -> "DatasetStatistics":
+        self.rows += len(df)
+        self.moments.update(df[self.numeric_columns].astype(np.float64).values)
+        self.counter.update(df)
+        return self
+
+    def merge(self, other: "DatasetStatistics") -> "DatasetStatistics":
+        self.rows += other.rows
+        self.moments.merge(other.moments)
+        self.counter.merge(other.counter)
+        return self
+
+    def instances_per_class(self, target: str = 'Race') -> dict:
+        return dict(sorted(self.counter.counts[target].items(), key=lambda item: item[1], reverse=True))
+
+    def median(self, column: str):
+        values, counts = self.counter.sorted_counts(column)
+        cumulative = np.cumsum(counts)
+        return values[int(np.searchsorted(cumulative, (cumulative[-1] + 1) // 2))]
+
+    def describe(self, columns: list[str]) -> pd.DataFrame:
+        table = {}
+        for column in columns:
+            values, counts = self.counter.sorted_counts(column)
+            values = np.array(values, dtype=np.float64)
+            total = counts.sum()
+            mean = (values * counts).sum() / total
+            std = np.sqrt(((values - mean) ** 2 * counts).sum() / max(total - 1, 1))
+            table[column] = [total, mean, std, values[0], _quantile(values, counts, 0.25),
+                             _quantile(values, counts, 0.5), _quantile(values, counts, 0.75), values[-1]]
+        return pd.DataFrame(table, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+
+    def summary(self, behavioral_columns: list[str]) -> dict:
+        """Same layout as `engine.report.compute_statistics`."""
+        behavioral = self.describe([column for column in behavioral_columns if column in self.numeric_columns])
+        frequencies = {}
+        for column in self.counter.columns:
+            values, counts = self.counter.sorted_counts(column)
+            frequencies[column] = {str(value): int(count) for value, count in zip(values, counts)}
+        return {
+            'instances': self.rows,
+            'frequencies': frequencies,
+            'behavioral': {'index': behavioral.index.tolist(), 'columns': behavioral.columns.tolist(),
+                           'values': behavioral.values.tolist()},
+            'correlation': {'columns': self.numeric_columns, 'values': self.moments.correlation().tolist()},
+        }
+
+    def save(self, path: str):
+        state = {'numeric_columns': self.numeric_columns, 'categorical_columns': self.categorical_columns,
+                 'rows': self.rows, 'moments': self.moments.state_dict(), 'counts': self.counter.state_dict()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "DatasetStatistics":
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        statistics = cls(state['numeric_columns'], state['categorical_columns'])
+        statistics.rows = state['rows']
+        statistics.moments = MomentAccumulator.from_state(state['moments'])
+        statistics.counter = ValueCounter.from_state(state['counts'])
+        return statistics
+
+    @classmethod
+    def load_or_create(cls, path: str, numeric_columns: list[str], categorical_columns: list[str]):
+        if os.path.isfile(path):
+            return cls.load(path)
+        return cls(numeric_columns, categorical_columns)
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    """
+    Everything that decides the outcome of a training run. `seed` feeds the Color/Pattern sampling and the
+    balancing in `process_dataset`, and `MLPModel` derives independent split, weight-init and shuffle streams
+    from it, so two runs with the same config produce the same model. Setting `class_weights` ('loss' or
+    'sampling') skips dataset balancing and compensates for rare breeds inside training instead.
+    """
+    seed: int = 42
+    use_smote: bool = True
+    test_size: float = 0.2
+    hidden_size: int | list[int] = 100
+    learning_rate: float = 0.1
+    epochs: int = 200
+    batch_size: int = 50
+    class_weights: str | None = None
+
+    def dataset_kwargs(self) -> dict:
+        return {'use_smote': self.use_smote, 'seed': self.seed, 'balance': self.class_weights is None}
+
+    def model_kwargs(self) -> dict:
+        return {'hidden_size': self.hidden_size, 'learning_rate': self.learning_rate, 'epochs': self.epochs,
+                'seed': self.seed, 'test_size': self.test_size, 'class_weights': self.class_weights}
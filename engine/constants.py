@@ -5,3 +5,14 @@ ROOT_DIR_PATH = Path(__file__).parent.parent.resolve()
 DATASET_DIR_NAME = "data"
 DATASET_FILE_NAME = "dataset.csv"
 DATASET_PATH = os.path.join(ROOT_DIR_PATH, DATASET_DIR_NAME, DATASET_FILE_NAME)
+
+CAT_ATTRIBUTES = [
+    'Sexe', 'Age', 'Nombre', 'Logement', 'Zone',
+    'Ext', 'Obs', 'Timide', 'Calme', 'Effraye', 'Intelligent', 'Vigilant', 'Perseverant',
+    'Affectueux', 'Amical', 'Solitaire', 'Brutal', 'Dominant', 'Agressif', 'Impulsif', 'Previsible', 'Distrait',
+    'Abondance', 'PredOiseau', 'PredMamm', 'Color', 'Pattern'
+]
+
+CACHE_DIR_NAME = ".cache"
+CACHE_DIR_PATH = os.path.join(ROOT_DIR_PATH, CACHE_DIR_NAME)
+PREPROCESSING_VERSION = 2
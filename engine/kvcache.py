@@ -0,0 +1,34 @@
+import os
+import sqlite3
+
+
+class SqliteCache:
+    """
+    Persistent string -> string cache in one SQLite table; used for translations and LLM responses.
+    """
+
+    def __init__(self, path: str, table: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.table = table
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, text TEXT NOT NULL)")
+
+    def get(self, key: str) -> str | None:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: list[str]) -> dict:
+        found = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = self.connection.execute(
+                f"SELECT key, text FROM {self.table} WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+            found.update(rows)
+        return found
+
+    def put(self, key: str, text: str):
+        self.put_many({key: text})
+
+    def put_many(self, items: dict):
+        with self.connection:
+            self.connection.executemany(f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?)", items.items())
@@ -0,0 +1,145 @@
+from functools import lru_cache
+
+ATTRIBUTE_SYNONYMS = {
+    'Ext': {"extroverted", "outgoing", "sociable"},
+    'Obs': {"observant", "attentive", "watchful"},
+    'Timide': {"timid", "shy", "introverted", "bashful", "reserved"},
+    'Calme': {"calm", "peaceful", "tranquil", "serene", "relaxed"},
+    'Effraye': {"afraid", "scared", "fearful", "frightened", "terrified"},
+    'Intelligent': {"intelligent", "smart", "clever", "bright", "brainy"},
+    'Vigilant': {"vigilant", "alert", "aware", "cautious"},
+    'Perseverant': {"perseverant", "persistent", "determined", "tenacious"},
+    'Affectueux': {"affectionate", "loving", "friendly", "cuddly", "warm"},
+    'Amical': {"amiable", "amical", "friendly", "kind", "cordial"},
+    'Solitaire': {"solitary", "loner", "independent"},
+    'Brutal': {"brutal", "violent", "vicious", "savage"},
+    'Dominant': {"dominant", "bossy", "territorial", "assertive", "leader"},
+    'Agressif': {"aggressive", "hostile", "antagonistic", "belligerent"},
+    'Impulsif': {"impulsive", "rash", "hasty", "spontaneous"},
+    'Previsible': {"predictable", "foreseeable", "expected"},
+    'Distrait': {"distracted", "inattentive", "spacey", "absentminded"},
+}
+
+INTENSIFIERS = {
+    "slightly": -1,
+    "somewhat": -1,
+    "fairly": -1,
+    "mildly": -1,
+    "a bit": -1,
+
+    "very": +3,
+    "quite": +4,
+    "extremely": +5,
+    "incredibly": +6,
+    "remarkably": +7,
+    "truly": +8,
+    "highly": +9,
+    "super": +9,
+    "insanely": +10,
+}
+
+SEX_SYNONYMS = {
+    "male": 1, "boy": 1, "masculine": 1,
+    "female": 0, "girl": 0, "feminine": 0
+}
+
+ABUNDANCE_SYNONYMS = {
+    "scarce": 1, "limited": 1,
+    "moderate": 2, "enough": 2,
+    "plentiful": 3, "abundant": 3, "lots": 3
+}
+
+BIRD_SYNONYMS = {"bird", "birds", "sparrow", "pigeon", "parrot"}
+MAMM_SYNONYMS = {"mouse", "mice", "rat", "squirrel", "hamster"}
+
+FIRST_MATCH = 0
+LAST_MATCH = 1
+TRAIT = 2
+
+
+class AttributeLexicon:
+    """
+    Maps every known token straight to the (rule, attribute, value) entries it triggers, so parsing is a single
+    dictionary lookup per token. Multi-word intensifiers ("a bit") are matched on the longest phrase first.
+    """
+
+    def __init__(self, color_classes: tuple = (), pattern_classes: tuple = (), zone_classes: tuple = ()):
+        entries = {}
+
+        def add(token, rule, attribute, value):
+            entries.setdefault(token, []).append((rule, attribute, value))
+
+        for token, value in SEX_SYNONYMS.items():
+            add(token, FIRST_MATCH, 'Sexe', value)
+        for attribute, classes in (('Color', color_classes), ('Pattern', pattern_classes), ('Zone', zone_classes)):
+            codes = {}
+            for index, name in enumerate(classes):
+                token = str(name).lower()
+                if token == name:
+                    codes[token] = index
+                else:
+                    codes.setdefault(token, 0)
+            for token, code in codes.items():
+                add(token, FIRST_MATCH, attribute, code)
+        for attribute, synonyms in ATTRIBUTE_SYNONYMS.items():
+            for token in synonyms:
+                if not any(rule == TRAIT for rule, _, _ in entries.get(token, [])):
+                    add(token, TRAIT, attribute, 0)
+        for token, value in ABUNDANCE_SYNONYMS.items():
+            add(token, LAST_MATCH, 'Abondance', value)
+        for token in BIRD_SYNONYMS:
+            add(token, LAST_MATCH, 'PredOiseau', 1)
+        for token in MAMM_SYNONYMS:
+            add(token, LAST_MATCH, 'PredMamm', 1)
+
+        self.entries = {token: tuple(values) for token, values in entries.items()}
+        self.intensifiers = {tuple(phrase.split()): value for phrase, value in INTENSIFIERS.items()}
+        self.max_phrase_length = max(len(phrase) for phrase in self.intensifiers)
+
+    def _match_intensifier(self, tokens: list, i: int) -> tuple[int, int]:
+        for length in range(min(self.max_phrase_length, len(tokens) - i), 0, -1):
+            value = self.intensifiers.get(tuple(tokens[i:i + length]))
+            if value is not None:
+                return length, value
+        return 0, 0
+
+    def scan(self, lower_tokens: list, cat_dict: dict) -> dict:
+        """
+        Fills `cat_dict` from the tokens; returns the accumulated intensity offset per behavioural trait.
+        """
+        matched = set()
+        offsets = {}
+        current_intensity = 0
+        i = 0
+
+        while i < len(lower_tokens):
+            length, intensity = self._match_intensifier(lower_tokens, i)
+            if length:
+                current_intensity += intensity
+                i += length
+                continue
+
+            for rule, attribute, value in self.entries.get(lower_tokens[i], ()):
+                if rule == TRAIT:
+                    offsets[attribute] = offsets.get(attribute, 0) + current_intensity
+                    current_intensity = 0
+                elif rule == LAST_MATCH:
+                    cat_dict[attribute] = value
+                elif attribute not in matched:
+                    matched.add(attribute)
+                    cat_dict[attribute] = value
+            i += 1
+
+        return offsets
+
+
+@lru_cache(maxsize=16)
+def _cached_lexicon(color_classes: tuple, pattern_classes: tuple, zone_classes: tuple) -> AttributeLexicon:
+    return AttributeLexicon(color_classes, pattern_classes, zone_classes)
+
+
+def compile_lexicon(color_encoder=None, pattern_encoder=None, zone_encoder=None) -> AttributeLexicon:
+    def classes(encoder):
+        return tuple(encoder.classes_) if encoder is not None else ()
+
+    return _cached_lexicon(classes(color_encoder), classes(pattern_encoder), classes(zone_encoder))
@@ -0,0 +1,68 @@
+import asyncio
+import hashlib
+import json
+import os
+from engine.constants import CACHE_DIR_PATH
+from engine.kvcache import SqliteCache
+
+LLM_CACHE_PATH = os.path.join(CACHE_DIR_PATH, "llm_responses.sqlite3")
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+class LLMClient:
+    """
+    Async chat-completion client: requests run concurrently (at most `max_concurrency` at a time), are retried
+    with exponential backoff, and responses are cached persistently by (model, messages, parameters).
+    `api_base` points the client at another OpenAI-compatible server, e.g. a local mock.
+    """
+
+    def __init__(self, model: str = DEFAULT_MODEL, max_concurrency: int = 5, retries: int = 3,
+                 backoff: float = 0.5, cache: SqliteCache | None = None, api_base: str | None = None):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = cache if cache is not None else SqliteCache(LLM_CACHE_PATH, "responses")
+        self.api_base = api_base
+
+    def _key(self, messages: list[dict], params: dict) -> str:
+        payload = json.dumps({'model': self.model, 'messages': messages, **params}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    async def _request(self, messages: list[dict], params: dict) -> str:
+        import openai
+
+        kwargs = {'api_base': self.api_base} if self.api_base else {}
+        for attempt in range(self.retries + 1):
+            try:
+                response = await openai.ChatCompletion.acreate(model=self.model, messages=messages, **params,
+                                                               **kwargs)
+                return " ".join(choice.message["content"].strip() for choice in response.choices)
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def complete_many_async(self, prompts: list[list[dict]], **params) -> list[str]:
+        keys = [self._key(messages, params) for messages in prompts]
+        cached = self.cache.get_many(list(set(keys)))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def complete(messages):
+            async with semaphore:
+                return await self._request(messages, params)
+
+        missing = {key: messages for key, messages in zip(keys, prompts) if key not in cached}
+        responses = await asyncio.gather(*(complete(messages) for messages in missing.values()))
+
+        new_items = dict(zip(missing.keys(), responses))
+        if new_items:
+            self.cache.put_many(new_items)
+            cached.update(new_items)
+        return [cached[key] for key in keys]
+
+    def complete_many(self, prompts: list[list[dict]], **params) -> list[str]:
+        return asyncio.run(self.complete_many_async(prompts, **params))
+
+    def complete(self, messages: list[dict], **params) -> str:
+        return self.complete_many([messages], **params)[0]
@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from engine.text_processing import (translate_many_to_english, get_stylometry_info, replace_words_with_variants,
+                                    extract_keywords, parse_english_sentence_to_cat_attributes, load_variant_table,
+                                    word_tokenize)
+from engine.utils import EncodingSchema
+
+_worker_options = {}
+
+
+def read_documents(input_path: str) -> list[dict]:
+    """
+    Reads `{"id": ..., "text": ...}` lines from a JSONL file (id defaults to `line-<index>`), or every `.txt` file
+    of a directory (id = file name).
+    """
+    if os.path.isdir(input_path):
+        documents = []
+        for name in sorted(os.listdir(input_path)):
+            if name.endswith('.txt'):
+                with open(os.path.join(input_path, name), 'r', encoding='utf-8') as f:
+                    documents.append({'id': name, 'text': f.read().strip()})
+        return documents
+
+    with open(input_path, 'r', encoding='utf-8') as f:
+        documents = [json.loads(line) for line in f if line.strip()]
+    for i, document in enumerate(documents):
+        document.setdefault('id', f"line-{i}")
+    return documents
+
+
+def process_document(document: dict, label_encoders: dict, augment_ratio: float = 0.0, top_n: int = 5) -> dict:
+    text = document['text']
+    tokens = word_tokenize(text)
+
+    stylometry = get_stylometry_info(text, tokens)
+    result = {
+        'id': document['id'],
+        'text': text,
+        'word_count': stylometry['word_count'],
+        'char_count': stylometry['char_count'],
+        'keywords': extract_keywords(text, top_n, tokens),
+        'attributes': parse_english_sentence_to_cat_attributes(
+            text,
+            color_encoder=label_encoders.get('Color'),
+            pattern_encoder=label_encoders.get('Pattern'),
+            zone_encoder=label_encoders.get('Zone'),
+            tokens=tokens
+        ),
+    }
+    if augment_ratio > 0:
+        result['alt_text'] = replace_words_with_variants(text, augment_ratio, tokens)
+    return result
+
+
+def _init_worker(label_encoders: dict, augment_ratio: float, top_n: int, variant_table: str | None):
+    if variant_table is not None:
+        load_variant_table(variant_table)
+    _worker_options.update(label_encoders=label_encoders, augment_ratio=augment_ratio, top_n=top_n)
+
+
+def _process_in_worker(document: dict) -> dict:
+    return process_document(document, **_worker_options)
+
+
+def run_pipeline(documents: list[dict], label_encoders: dict, model=None, translate: bool = False,
+                 augment_ratio: float = 0.0, top_n: int = 5, workers: int | None = None,
+                 variant_table: str | None = None) -> list[dict]:
+    """
+    Tokenizes every document once, runs all stages on the shared tokens in a worker pool and, when a model is
+    given, classifies all parsed attribute vectors in one batched `predict` call. Translation, when enabled,
+    happens up front in cached batches.
+    """
+    if translate:
+        texts = translate_many_to_english([document['text'] for document in documents])
+        documents = [{**document, 'text': text} for document, text in zip(documents, texts)]
+
+    if workers == 1:
+        if variant_table is not None:
+            load_variant_table(variant_table)
+        results = [process_document(document, label_encoders, augment_ratio, top_n)
+                   for document in documents]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(label_encoders, augment_ratio, top_n, variant_table)) as executor:
+            chunksize = max(1, len(documents) // (4 * (workers or os.cpu_count() or 1)))
+            results = list(executor.map(_process_in_worker, documents, chunksize=chunksize))
+
+    if model is not None and results:
+        races = model.predict([result['attributes'] for result in results])
+        for result, race in zip(results, races):
+            result['race'] = str(race)
+    return results
+
+
+if __name__ == "__main__":
+    from mlp.inference import InferenceModel
+
+    parser = argparse.ArgumentParser(description="Batch cat description pipeline: parse and classify many texts.")
+    parser.add_argument("--input", required=True, help="JSONL file with {id, text} lines or a directory of .txt files")
+    parser.add_argument("--output", default="-", help="Output JSONL path (default: stdout)")
+    parser.add_argument("--model", default="mlp_model.npz", help="Inference artifact from export_inference_model")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--translate", action="store_true", help="Translate each text to English first")
+    parser.add_argument("--augment-ratio", type=float, default=0.0, help="Also produce WordNet-variant text")
+    parser.add_argument("--variant-table", default=None, help="Directory written by `python -m engine.variants`")
+
+    args = parser.parse_args()
+
+    inference_model = InferenceModel.load(args.model)
+    pipeline_results = run_pipeline(read_documents(args.input), EncodingSchema.from_classes(inference_model.classes),
+                                    inference_model, args.translate, args.augment_ratio, workers=args.workers,
+                                    variant_table=args.variant_table)
+
+    lines = "".join(json.dumps(result, ensure_ascii=False) + "\n" for result in pipeline_results)
+    if args.output == "-":
+        print(lines, end="")
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(lines)
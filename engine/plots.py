@@ -1,11 +1,13 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 
 
-def df_correlation(df: pd.DataFrame):
+def df_correlation(df: pd.DataFrame, show: bool = True, path: str | None = None):
+    import matplotlib.pyplot as plt
+
     plt.close()
     columns = df.columns
-    correlation_matrix = df[columns].corr()
+    correlation_matrix = df[columns].corr(numeric_only=True)
+    columns = correlation_matrix.columns
 
     plt.figure(figsize=(12, 10))
     plt.matshow(correlation_matrix, fignum=1)
@@ -13,6 +15,9 @@ def df_correlation(df: pd.DataFrame):
     plt.xticks(range(len(columns)), columns, rotation=90)
     plt.yticks(range(len(columns)), columns)
     plt.title("Attribute correlation")
-    plt.show()
+    if path is not None:
+        plt.savefig(path)
+    if show:
+        plt.show()
 
 
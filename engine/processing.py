@@ -1,12 +1,202 @@
-import random
-from sklearn.utils import resample
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
-from imblearn.over_sampling import SMOTENC
-from sklearn.preprocessing import LabelEncoder
+from engine.accumulators import DatasetStatistics
+from engine.constants import CACHE_DIR_PATH, PREPROCESSING_VERSION
+
+DROPPED_COLUMNS = ["Row.names", "Plus", "Horodateur"]
+CSV_CATEGORICAL_COLUMNS = ["Sexe", "Age", "Race", "Nombre", "Logement", "Zone", "Abondance"]
+SCORE_COLUMNS = [
+    "Ext", "Obs", "Timide", "Calme", "Effrayé", "Intelligent", "Vigilant", "Perséverant", "Affectueux", "Amical",
+    "Solitaire", "Brutal", "Dominant", "Agressif", "Impulsif", "Prévisible", "Distrait", "PredOiseau", "PredMamm"
+]
+MAX_DEDUPE_PARTITIONS = 256
+HASH_ENTRY_DTYPE = np.dtype([('hash', np.uint64), ('row', np.int64)])
+
 
 def _read_dataset_to_df(dataset_csv_path: str) -> pd.DataFrame:
-    return pd.read_csv(dataset_csv_path).drop(columns=["Row.names", "Plus", "Horodateur"])
+    return pd.read_csv(dataset_csv_path).drop(columns=DROPPED_COLUMNS)
+
+
+def _read_dataset_chunks(dataset_csv_path: str, chunksize: int, categories: dict | None = None):
+    dtypes = {column: "Int8" for column in SCORE_COLUMNS}
+    for column in CSV_CATEGORICAL_COLUMNS:
+        dtypes[column] = pd.CategoricalDtype(categories[column]) if categories else "category"
+
+    return pd.read_csv(dataset_csv_path, usecols=CSV_CATEGORICAL_COLUMNS + SCORE_COLUMNS, dtype=dtypes,
+                       na_values={"Abondance": ["NSP"]}, chunksize=chunksize)
+
+
+def _collect_file_statistics(dataset_csv_path: str, chunksize: int) -> DatasetStatistics:
+    statistics = DatasetStatistics(SCORE_COLUMNS, CSV_CATEGORICAL_COLUMNS)
+    for chunk in _read_dataset_chunks(dataset_csv_path, chunksize):
+        statistics.update(chunk)
+    return statistics
+
+
+def collect_statistics(dataset_csv_paths: str | list[str], chunksize: int = 10_000,
+                       statistics: DatasetStatistics | None = None, workers: int | None = None) -> DatasetStatistics:
+    """
+    Streams raw survey CSVs into a `DatasetStatistics` (several files are read in parallel and merged), folding
+    them into `statistics` when given.
+    """
+    paths = [dataset_csv_paths] if isinstance(dataset_csv_paths, str) else list(dataset_csv_paths)
+    if statistics is None:
+        statistics = DatasetStatistics(SCORE_COLUMNS, CSV_CATEGORICAL_COLUMNS)
+
+    if len(paths) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(_collect_file_statistics, paths, [chunksize] * len(paths)))
+    else:
+        partials = [_collect_file_statistics(path, chunksize) for path in paths]
+
+    for partial in partials:
+        statistics.merge(partial)
+    return statistics
+
+
+def update_statistics(statistics_path: str, dataset_csv_paths: str | list[str], chunksize: int = 10_000,
+                      workers: int | None = None) -> DatasetStatistics:
+    statistics = DatasetStatistics.load_or_create(statistics_path, SCORE_COLUMNS, CSV_CATEGORICAL_COLUMNS)
+    statistics = collect_statistics(dataset_csv_paths, chunksize, statistics, workers)
+    statistics.save(statistics_path)
+    return statistics
+
+
+def _streaming_fill_values(dataset_csv_path: str, chunksize: int) -> tuple[dict, dict, int]:
+    statistics = collect_statistics(dataset_csv_path, chunksize)
+
+    # A column with no values at all gets no fill value here; callers can supply one (see `dataset_fill_values`).
+    fill_values = {column: int(statistics.median(column)) for column in SCORE_COLUMNS
+                   if statistics.counter.counts[column]}
+    categories = {}
+    for column in CSV_CATEGORICAL_COLUMNS:
+        values, counts = statistics.counter.sorted_counts(column)
+        if len(values):
+            fill_values[column] = values[int(np.argmax(counts))]
+        categories[column] = values
+
+    return fill_values, categories, statistics.rows
+
+
+def dataset_fill_values(dataset_csv_path: str, chunksize: int = 10_000) -> dict:
+    """
+    Medians of the score columns and modes of the categorical ones, for imputing rows that are processed on
+    their own (a small batch may have a column that is entirely missing).
+    """
+    fill_values, _, _ = _streaming_fill_values(dataset_csv_path, chunksize)
+    return fill_values
+
+
+def _lowercase_categories(column: pd.Series) -> pd.Series:
+    lowered = pd.Index(column.cat.categories.astype(str).str.lower())
+    if lowered.is_unique:
+        return column.cat.rename_categories(lowered)
+    return column.astype(str).str.lower().astype("category")
+
+
+def _clean_chunks(dataset_csv_path: str, chunksize: int, fill_values: dict, categories: dict, seed: int, rows: int):
+    rngs = _attribute_rngs(seed, rows)
+    for chunk in _read_dataset_chunks(dataset_csv_path, chunksize, categories):
+        chunk = chunk.fillna(fill_values)
+        chunk[SCORE_COLUMNS] = chunk[SCORE_COLUMNS].astype(np.int8)
+        yield _add_new_attributes(chunk, rngs=rngs)
+
+
+def _duplicated_rows(chunks, rows: int, chunksize: int, directory: str) -> np.ndarray:
+    """
+    Disk-backed mask of the rows that repeat an earlier row. (hash, row) pairs are spilled to partition files in
+    `directory` and each partition is deduplicated on its own, so only one partition is ever in memory.
+    """
+    partitions = max(1, min(MAX_DEDUPE_PARTITIONS, rows // chunksize))
+    paths = [os.path.join(directory, f"hashes_{i}.bin") for i in range(partitions)]
+    files = [open(path, 'wb') for path in paths]
+    try:
+        start = 0
+        for chunk in chunks:
+            entries = np.empty(len(chunk), dtype=HASH_ENTRY_DTYPE)
+            entries['hash'] = pd.util.hash_pandas_object(chunk, index=False).values
+            entries['row'] = np.arange(start, start + len(chunk))
+            start += len(chunk)
+
+            partition = entries['hash'] % partitions
+            order = np.argsort(partition, kind='stable')
+            bounds = np.searchsorted(partition[order], np.arange(partitions + 1))
+            for i, file in enumerate(files):
+                entries[order[bounds[i]:bounds[i + 1]]].tofile(file)
+    finally:
+        for file in files:
+            file.close()
+
+    duplicated = np.lib.format.open_memmap(os.path.join(directory, "duplicated.npy"), mode='w+', dtype=bool,
+                                           shape=(rows,))
+    for path in paths:
+        entries = np.fromfile(path, dtype=HASH_ENTRY_DTYPE)
+        os.remove(path)
+        # Rows were appended in order, so a stable sort keeps the first occurrence of every hash first.
+        entries = entries[np.argsort(entries['hash'], kind='stable')]
+        duplicated[entries['row'][1:][entries['hash'][1:] == entries['hash'][:-1]]] = True
+    return duplicated
+
+
+def _iter_dataset_streaming(dataset_csv_path: str, chunksize: int, seed: int = 42,
+                            fixed_fill_values: dict | None = None):
+    """
+    Yields cleaned chunks (imputed, Color/Pattern added, duplicates across all chunks removed, categories
+    lowercased) with `category`/`int8` columns. The CSV is read twice: the first pass spills row hashes to
+    temporary files to find the duplicates (see `_duplicated_rows`), the second yields the remaining rows.
+    Memory is bounded by one chunk plus one partition of 16-byte hash entries (about a chunk's worth, or 1/256
+    of the rows for exports of more than 256 chunks).
+    """
+    fill_values, categories, rows = _streaming_fill_values(dataset_csv_path, chunksize)
+    if fixed_fill_values:
+        fill_values.update(fixed_fill_values)
+        for column in CSV_CATEGORICAL_COLUMNS:
+            if column in fixed_fill_values and fixed_fill_values[column] not in categories[column]:
+                categories[column] = sorted(categories[column] + [fixed_fill_values[column]])
+
+    attribute_dtypes = [pd.CategoricalDtype([value.lower() for value in table[0]]) for table in (COLOR_TABLE,
+                                                                                              PATTERN_TABLE)]
+    with tempfile.TemporaryDirectory() as directory:
+        duplicated = _duplicated_rows(_clean_chunks(dataset_csv_path, chunksize, fill_values, categories, seed, rows),
+                                      rows, chunksize, directory)
+        start = 0
+        for chunk in _clean_chunks(dataset_csv_path, chunksize, fill_values, categories, seed, rows):
+            chunk_duplicated = np.asarray(duplicated[start:start + len(chunk)])
+            start += len(chunk)
+            if chunk_duplicated.any():
+                print("Duplicated values!")
+                print(chunk[chunk_duplicated].to_string())
+                chunk = chunk[~chunk_duplicated].copy()
+
+            for column in CSV_CATEGORICAL_COLUMNS:
+                chunk[column] = _lowercase_categories(chunk[column])
+            for column, dtype in zip(('Color', 'Pattern'), attribute_dtypes):
+                chunk[column] = chunk[column].str.lower().astype(dtype)
+            yield chunk.reset_index(drop=True)
+        del duplicated
+
+
+def _write_dataset_streaming(dataset_csv_path: str, output_path: str, chunksize: int, seed: int = 42,
+                             fixed_fill_values: dict | None = None) -> str:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in _iter_dataset_streaming(dataset_csv_path, chunksize, seed, fixed_fill_values):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return output_path
 
 
 def _process_missing_values(df: pd.DataFrame) -> pd.DataFrame:
@@ -46,46 +236,81 @@ def _process_duplicated_values(df: pd.DataFrame) -> pd.DataFrame:
     return df.drop_duplicates()
 
 
-def _add_new_attributes(df: pd.DataFrame) -> pd.DataFrame:
-
-    def get_random_attribute(breed, attribute_type):
-        if attribute_type == 'color':
-            return random.choice(breed_color_pattern_updated.get(breed, ('Various', 'Various'))[0].split(', '))
-        elif attribute_type == 'pattern':
-            return random.choice(breed_color_pattern_updated.get(breed, ('Various', 'Various'))[1].split(', '))
-
-    breed_color_pattern_updated = {
-        'BEN': ('Brown, Silver, Snow', 'Spotted, Marbled'),
-        'SBI': ('Cream, Seal, Blue, Chocolate, Lilac', 'Colorpoint'),
-        'BRI': ('Blue, Black, White, Cream', 'Solid, Tabby, Bicolor'),
-        'CHA': ('Blue-gray', 'Solid'),
-        'EUR': ('Tabby, Black, White, Gray, Cream', 'Tabby, Solid, Bicolor'),
-        'MCO': ('Brown, Red, Cream, Blue', 'Tabby, Solid, Tortie, Bicolor'),
-        'PER': ('White, Black, Blue, Red, Cream, Tortoiseshell', 'Solid, Tabby, Shaded, Smoke, Tortie'),
-        'RAG': ('White, Seal, Blue, Chocolate, Lilac', 'Colorpoint, Mitted, Bicolor'),
-        'SPH': ('Brown, Silver, Black', 'Spotted, Marbled'),
-        'ORI': ('Black, White, Cream, Red, Blue, Tortie', 'Solid, Bicolor, Tortie'),
-        'TUV': ('White, Black, Blue, Red, Cream', 'Solid, Tabby, Bicolor'),
-        'Autre': ('Various', 'Various'),
-        'NSP': ('Various', 'Various')
-    }
-
-    df['Color'] = df['Race'].map(lambda breed: get_random_attribute(breed, 'color'))
-    df['Pattern'] = df['Race'].map(lambda breed: get_random_attribute(breed, 'pattern'))
+BREED_COLOR_PATTERN = {
+    'BEN': ('Brown, Silver, Snow', 'Spotted, Marbled'),
+    'SBI': ('Cream, Seal, Blue, Chocolate, Lilac', 'Colorpoint'),
+    'BRI': ('Blue, Black, White, Cream', 'Solid, Tabby, Bicolor'),
+    'CHA': ('Blue-gray', 'Solid'),
+    'EUR': ('Tabby, Black, White, Gray, Cream', 'Tabby, Solid, Bicolor'),
+    'MCO': ('Brown, Red, Cream, Blue', 'Tabby, Solid, Tortie, Bicolor'),
+    'PER': ('White, Black, Blue, Red, Cream, Tortoiseshell', 'Solid, Tabby, Shaded, Smoke, Tortie'),
+    'RAG': ('White, Seal, Blue, Chocolate, Lilac', 'Colorpoint, Mitted, Bicolor'),
+    'SPH': ('Brown, Silver, Black', 'Spotted, Marbled'),
+    'ORI': ('Black, White, Cream, Red, Blue, Tortie', 'Solid, Bicolor, Tortie'),
+    'TUV': ('White, Black, Blue, Red, Cream', 'Solid, Tabby, Bicolor'),
+    'Autre': ('Various', 'Various'),
+    'NSP': ('Various', 'Various')
+}
+DEFAULT_COLOR_PATTERN = ('Various', 'Various')
+
+
+def _compile_attribute_table(position: int) -> tuple[list, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flattens the options of every breed into one index array; the last slot is the default for unknown breeds.
+    """
+    options_per_breed = [value[position].split(', ') for value in BREED_COLOR_PATTERN.values()]
+    options_per_breed.append(DEFAULT_COLOR_PATTERN[position].split(', '))
+
+    vocabulary = sorted({option for options in options_per_breed for option in options})
+    codes = np.array([vocabulary.index(option) for options in options_per_breed for option in options])
+    counts = np.array([len(options) for options in options_per_breed])
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return vocabulary, codes, offsets, counts
+
+
+BREED_NAMES = list(BREED_COLOR_PATTERN.keys())
+COLOR_TABLE = _compile_attribute_table(0)
+PATTERN_TABLE = _compile_attribute_table(1)
+
+
+def _sample_attribute(breed_indices: np.ndarray, table: tuple, rng: np.random.Generator) -> np.ndarray:
+    vocabulary, codes, offsets, counts = table
+    choices = offsets[breed_indices] + (rng.random(len(breed_indices)) * counts[breed_indices]).astype(np.int64)
+    return np.asarray(vocabulary, dtype=object)[codes[choices]]
+
+
+def _attribute_rngs(seed: int, rows: int) -> tuple[np.random.Generator, np.random.Generator]:
+    # One generator drawing every Color before every Pattern, split in two so chunks can be sampled in order.
+    pattern_bits = np.random.PCG64(seed)
+    pattern_bits.advance(rows)
+    return np.random.default_rng(seed), np.random.Generator(pattern_bits)
+
+
+def _add_new_attributes(df: pd.DataFrame, seed: int = 42, rngs: tuple | None = None) -> pd.DataFrame:
+    color_rng, pattern_rng = rngs if rngs is not None else _attribute_rngs(seed, len(df))
+    breed_indices = pd.Categorical(df['Race'], categories=BREED_NAMES).codes.astype(np.int64)
+    breed_indices[breed_indices < 0] = len(BREED_NAMES)
+
+    df['Color'] = _sample_attribute(breed_indices, COLOR_TABLE, color_rng)
+    df['Pattern'] = _sample_attribute(breed_indices, PATTERN_TABLE, pattern_rng)
 
     return df
 
 
-def _balance_dataset_smote(df: pd.DataFrame, target_column: str) -> pd.DataFrame:
+def _balance_dataset_smote(df: pd.DataFrame, target_column: str, seed: int = 42) -> pd.DataFrame:
+    from imblearn.over_sampling import SMOTENC
+    from sklearn.preprocessing import LabelEncoder
+
     x = df.drop(target_column, axis=1)
     y = df[target_column]
 
     categorical_features = x.select_dtypes(include=['object', 'category']).columns.tolist()
     categorical_indices = [x.columns.get_loc(col) for col in categorical_features]
 
+    encoders = {}
     for col in categorical_features:
-        le = LabelEncoder()
-        x[col] = le.fit_transform(x[col])
+        encoders[col] = LabelEncoder()
+        x[col] = encoders[col].fit_transform(x[col])
 
     if y.dtype == 'object' or str(y.dtype) == 'category':
         y_le = LabelEncoder()
@@ -93,13 +318,11 @@ def _balance_dataset_smote(df: pd.DataFrame, target_column: str) -> pd.DataFrame
     else:
         y_le = None
 
-    smote_nc = SMOTENC(categorical_features=categorical_indices, random_state=42)
+    smote_nc = SMOTENC(categorical_features=categorical_indices, random_state=seed)
     x_resampled, y_resampled = smote_nc.fit_resample(x, y)
 
     for col in categorical_features:
-        le = LabelEncoder()
-        le.fit(df[col])
-        x_resampled[col] = le.inverse_transform(x_resampled[col])
+        x_resampled[col] = encoders[col].inverse_transform(x_resampled[col])
 
     if y_le is not None:
         y_resampled = y_le.inverse_transform(y_resampled)
@@ -109,7 +332,9 @@ def _balance_dataset_smote(df: pd.DataFrame, target_column: str) -> pd.DataFrame
     return resampled_df
 
 
-def _balance_dataset(df: pd.DataFrame, target_column: str) -> pd.DataFrame:
+def _balance_dataset(df: pd.DataFrame, target_column: str, seed: int = 42) -> pd.DataFrame:
+    from sklearn.utils import resample
+
     majority_class = df[target_column].value_counts().idxmax()
     majority_count = df[target_column].value_counts().max()
 
@@ -123,27 +348,74 @@ def _balance_dataset(df: pd.DataFrame, target_column: str) -> pd.DataFrame:
                 df_minority,
                 replace=True,
                 n_samples=majority_count,
-                random_state=42
+                random_state=seed
             )
             resampled_dfs.append(df_upsampled)
 
-    balanced_df = pd.concat(resampled_dfs, axis=0).sample(frac=1, random_state=42).reset_index(drop=True)
+    balanced_df = pd.concat(resampled_dfs, axis=0).sample(frac=1, random_state=seed).reset_index(drop=True)
 
     return balanced_df
 
 
-def process_dataset(dataset_csv_path: str, use_smote=False) -> pd.DataFrame:
-    df = _read_dataset_to_df(dataset_csv_path)
-    df = _process_missing_values(df)
-    df = _impute_missing_values(df)
-    df = _add_new_attributes(df)
-    df = _process_duplicated_values(df)
-    if use_smote:
-        df = _balance_dataset_smote(df, "Race")
+def _cache_path(dataset_csv_path: str, cache_dir: str, use_smote: bool, seed: int, streaming: bool,
+                balance: bool = True, fill_values: dict | None = None) -> str:
+    digest = hashlib.sha256()
+    with open(dataset_csv_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    digest.update(f"v{PREPROCESSING_VERSION}|smote={use_smote}|seed={seed}|streaming={streaming}|balance={balance}".encode())
+    if fill_values:
+        digest.update(json.dumps(fill_values, sort_keys=True, ensure_ascii=False).encode())
+    return os.path.join(cache_dir, f"dataset_{digest.hexdigest()[:16]}.parquet")
+
+
+def process_dataset(dataset_csv_path: str, use_smote=False, seed: int = 42, cache_dir: str | None = CACHE_DIR_PATH,
+                    chunksize: int | None = None, balance: bool = True,
+                    fill_values: dict | None = None) -> pd.DataFrame:
+    """
+    With `chunksize`, cleaning runs chunk by chunk and is written to Parquet as it goes, so memory during
+    ingestion is bounded by the chunk size (duplicates are found on disk) and the result keeps `category`/`int8`
+    columns. Balancing
+    (`balance=True`) still needs the whole compact frame in memory; use `balance=False` with class weights for
+    exports larger than RAM.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = _cache_path(dataset_csv_path, cache_dir, use_smote, seed, chunksize is not None, balance,
+                                 fill_values)
+        if os.path.isfile(cache_path):
+            return pd.read_parquet(cache_path)
+
+    if chunksize is not None:
+        if cache_path is not None and not balance:
+            os.makedirs(cache_dir, exist_ok=True)
+            _write_dataset_streaming(dataset_csv_path, cache_path + '.tmp', chunksize, seed, fill_values)
+            os.replace(cache_path + '.tmp', cache_path)
+            return pd.read_parquet(cache_path)
+
+        with tempfile.TemporaryDirectory() as directory:
+            df = pd.read_parquet(_write_dataset_streaming(dataset_csv_path, os.path.join(directory, 'dataset.parquet'),
+                                                          chunksize, seed, fill_values))
     else:
-        df = _balance_dataset(df, "Race")
-
-    string_cols = df.select_dtypes(include='object').columns
-    df[string_cols] = df[string_cols].apply(lambda col: col.str.lower())
+        df = _read_dataset_to_df(dataset_csv_path)
+        df = _process_missing_values(df)
+        if fill_values:
+            df = df.fillna(fill_values)
+        df = _impute_missing_values(df)
+        df = _add_new_attributes(df, seed)
+        df = _process_duplicated_values(df)
+
+    if balance and use_smote:
+        df = _balance_dataset_smote(df, "Race", seed)
+    elif balance:
+        df = _balance_dataset(df, "Race", seed)
+
+    string_cols = df.select_dtypes(include=['object']).columns
+    df[string_cols] = df[string_cols].apply(lambda col: col.astype(str).str.lower().where(col.notna()))
+
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        df.to_parquet(cache_path + '.tmp', index=False)
+        os.replace(cache_path + '.tmp', cache_path)
 
     return df
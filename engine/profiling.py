@@ -0,0 +1,33 @@
+import subprocess
+import sys
+import time
+from engine.constants import ROOT_DIR_PATH
+
+
+def import_profile(modules: list[str]) -> tuple[float, list[tuple[str, float]]]:
+    """
+    Imports `modules` in a fresh interpreter with `-X importtime` and returns the wall time of that process and
+    the self import time (seconds) summed per top-level package, most expensive first.
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT_DIR_PATH,
+                             capture_output=True, text=True)
+    wall_time = time.perf_counter() - start
+
+    per_package = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        per_package[package] = per_package.get(package, 0.0) + int(self_us) / 1e6
+
+    return wall_time, sorted(per_package.items(), key=lambda item: item[1], reverse=True)
+
+
+def print_import_profile(modules: list[str], top: int = 15):
+    wall_time, packages = import_profile(modules)
+    print(f"Startup for {', '.join(modules)}: {wall_time:.3f}s (interpreter included)")
+    for package, seconds in packages[:top]:
+        print(f"  {package:<24} {seconds * 1000:9.1f} ms")
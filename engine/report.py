@@ -0,0 +1,149 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+BEHAVIORAL_STATS = ['Brutal', 'Dominant', 'Agressif', 'Impulsif', 'Prévisible', 'Distrait']
+SKIPPED_COLUMNS = ['Horodateur']
+MANIFEST_NAME = '.report_manifest.json'
+RENDER_VERSION = 1
+
+
+def compute_statistics(df: pd.DataFrame) -> dict:
+    """
+    Value frequencies of every column, the behavioral `describe()` table and the correlation matrix of the
+    numeric columns.
+    """
+    columns = [column for column in df.columns if column not in SKIPPED_COLUMNS]
+    frequencies = {}
+    for column in columns:
+        counts = df[column].value_counts(sort=False).sort_index()
+        frequencies[column] = {str(value): int(count) for value, count in counts.items()}
+
+    numeric = df[columns].select_dtypes(include='number')
+    correlation = np.corrcoef(numeric.values.astype(np.float64), rowvar=False)
+    behavioral = df[[stat for stat in BEHAVIORAL_STATS if stat in df.columns]].describe()
+
+    return {
+        'instances': len(df),
+        'frequencies': frequencies,
+        'behavioral': {'index': behavioral.index.tolist(), 'columns': behavioral.columns.tolist(),
+                       'values': behavioral.values.tolist()},
+        'correlation': {'columns': numeric.columns.tolist(), 'values': np.nan_to_num(correlation).tolist()},
+    }
+
+
+def _figure_tasks(statistics: dict) -> list[tuple[str, str, dict]]:
+    tasks = [('frequency', f"{column}.png", {'attribute': column, 'frequencies': frequencies})
+             for column, frequencies in statistics['frequencies'].items()]
+    tasks.append(('table', "_behavioral_stats.png", statistics['behavioral']))
+    tasks.append(('correlation', "_correlation.png", statistics['correlation']))
+    return tasks
+
+
+def _fingerprint(kind: str, payload: dict) -> str:
+    encoded = json.dumps([RENDER_VERSION, kind, payload], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _render(kind: str, path: str, payload: dict) -> str:
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+
+    if kind == 'frequency':
+        fig = Figure()
+        ax = fig.subplots()
+        ax.bar(list(payload['frequencies']), list(payload['frequencies'].values()))
+        ax.tick_params(axis='x', labelrotation=90)
+        ax.set_xlabel(f"{payload['attribute']} classes")
+        ax.set_ylabel('Frequency')
+        ax.set_title(f"Value frequency in {payload['attribute']}")
+    elif kind == 'table':
+        fig = Figure(figsize=(10, 6))
+        ax = fig.subplots()
+        ax.set_axis_off()
+        cells = [[f"{value:.3f}" for value in row] for row in payload['values']]
+        table = ax.table(cellText=cells, rowLabels=payload['index'], colLabels=payload['columns'],
+                         cellLoc='center', loc='center')
+        table.scale(1, 2)
+        ax.set_title('Descriptive Statistics of Behavioral Traits', fontsize=16)
+    else:
+        columns = payload['columns']
+        fig = Figure(figsize=(12, 10))
+        ax = fig.subplots()
+        image = ax.matshow(np.array(payload['values']))
+        fig.colorbar(image)
+        ax.set_xticks(range(len(columns)), columns, rotation=90)
+        ax.set_yticks(range(len(columns)), columns)
+        ax.set_title("Attribute correlation")
+
+    fig.tight_layout()
+    fig.savefig(path)
+    return path
+
+
+def generate_report(df: pd.DataFrame | None = None, output_dir: str = 'plots', workers: int | None = None,
+                    force: bool = False, statistics: dict | None = None) -> dict:
+    """
+    Writes `statistics.json` and one figure per task into `output_dir`. Figures render on the Agg backend in
+    worker processes; a figure whose inputs hash the same as in the previous run (and still exists) is skipped.
+    `statistics` (e.g. `DatasetStatistics.summary`) replaces computing them from `df`.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if statistics is None:
+        statistics = compute_statistics(df)
+    with open(os.path.join(output_dir, 'statistics.json'), 'w', encoding='utf-8') as f:
+        json.dump(statistics, f, ensure_ascii=False, indent=2)
+
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.isfile(manifest_path) and not force:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    pending, fingerprints = [], {}
+    for kind, name, payload in _figure_tasks(statistics):
+        path = os.path.join(output_dir, name)
+        fingerprints[name] = _fingerprint(kind, payload)
+        if manifest.get(name) != fingerprints[name] or not os.path.isfile(path):
+            pending.append((kind, path, payload))
+
+    if len(pending) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_render, *zip(*pending)))
+    else:
+        for task in pending:
+            _render(*task)
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(fingerprints, f, indent=2)
+
+    return {'rendered': len(pending), 'skipped': len(fingerprints) - len(pending), 'statistics': statistics}
+
+
+if __name__ == "__main__":
+    from engine.constants import DATASET_PATH
+    from engine.processing import process_dataset
+
+    parser = argparse.ArgumentParser(description="Generate the dataset statistics and figures without a display.")
+    parser.add_argument("--output", default="plots")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--force", action="store_true", help="Render every figure even if its inputs are unchanged")
+    parser.add_argument("--smote", action="store_true", help="Report on the SMOTE-balanced dataset")
+    parser.add_argument("--statistics", default=None,
+                        help="Report on raw survey statistics accumulated by `update_statistics` instead")
+
+    args = parser.parse_args()
+
+    if args.statistics:
+        from engine.accumulators import DatasetStatistics
+        summary = DatasetStatistics.load(args.statistics).summary(BEHAVIORAL_STATS)
+        report = generate_report(None, args.output, args.workers, args.force, statistics=summary)
+    else:
+        report = generate_report(process_dataset(DATASET_PATH, use_smote=args.smote), args.output, args.workers,
+                                 args.force)
+    print(f"Rendered {report['rendered']} figures, skipped {report['skipped']} unchanged")
@@ -0,0 +1,49 @@
+import re
+from functools import lru_cache
+
+FACT_PATTERNS = (
+    ('age_num', r"(?P<value>\d+(?:\.\d+)?)\s*years?\s*old"),
+    ('age_hyphen', r"(?P<value>\d+(?:\.\d+)?)\s*-\s*year\s*-\s*old"),
+    ('age_text', r"(?P<value>[a-zA-Z]+)\s+years?\s+old"),
+    ('apartment', r"\blives?\s+in\s+an?\s+apartment\b"),
+    ('house', r"\blives?\s+in\s+a?\s+house\b"),
+    ('outdoors', r"\blives?\s+outdoors?\b"),
+    ('nombre_num', r"(?P<value>\d+)\s+(?:cats|companions|kittens|felines)"),
+    ('nombre_text', r"(?P<value>[a-zA-Z]+)\s+(?:cats|companions|kittens|felines)"),
+    ('hunts_birds', r"hunts?\s+birds?"),
+    ('hunts_mammals', r"hunts?\s+(?:mice|rats?)"),
+)
+
+
+class FactScanner:
+    """
+    All fact patterns joined into one regex of zero-width lookaheads, so a single `finditer` pass reports the
+    leftmost match of every pattern without one pattern consuming text another one needs.
+    """
+
+    def __init__(self, patterns: tuple):
+        self.names = [name for name, _ in patterns]
+        alternatives = [f"(?=(?P<{name}>{pattern.replace('(?P<value>', f'(?P<{name}_value>')}))"
+                        for name, pattern in patterns]
+        self.regex = re.compile("|".join(alternatives))
+
+    def scan(self, text: str) -> dict:
+        """
+        Returns {pattern name: captured value (or the whole match)} for the first occurrence of each pattern.
+        """
+        facts = {}
+        for match in self.regex.finditer(text):
+            name = match.lastgroup
+            if name in facts:
+                continue
+            groups = match.groupdict()
+            value = groups.get(f"{name}_value")
+            facts[name] = value if value is not None else groups[name]
+            if len(facts) == len(self.names):
+                break
+        return facts
+
+
+@lru_cache(maxsize=8)
+def compile_scanner(patterns: tuple = FACT_PATTERNS) -> FactScanner:
+    return FactScanner(patterns)
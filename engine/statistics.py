@@ -1,5 +1,4 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 
 
 def instances_per_class(df: pd.DataFrame) -> pd.DataFrame:
@@ -11,6 +10,8 @@ def df_value_frequency(df: pd.DataFrame) -> list[tuple[str, dict]]:
 
 
 def plot_value_frequency(df: pd.DataFrame, attribute: str, show=False) -> None:
+    import matplotlib.pyplot as plt
+
     plt.close()
     plt.hist(df[attribute], bins=50)
     plt.xlabel(f'{attribute} classes')
@@ -29,6 +30,8 @@ def plot_attributes_frequencies(df: pd.DataFrame, show: bool) -> None:
 
 
 def behavioral_stats(df: pd.DataFrame):
+    import matplotlib.pyplot as plt
+
     plt.close()
     fig, ax = plt.subplots(figsize=(10, 6))
 
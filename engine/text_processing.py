@@ -2,23 +2,31 @@ import sys
 import os
 import random
 import argparse
-import re
-from collections import defaultdict, Counter
-import joblib
-from rake_nltk import Rake
-import nltk
-from langdetect import detect
-from nltk.corpus import wordnet as wn
-from nltk.tokenize import word_tokenize
-from word2number import w2n
-from googletrans import Translator
-import openai
+from collections import Counter
+from functools import lru_cache
+from engine.constants import CAT_ATTRIBUTES
+from engine.llm import LLMClient
+from engine.lexicon import ATTRIBUTE_SYNONYMS, compile_lexicon
+from engine.scanner import compile_scanner
+from engine.translation import CachingTranslator
+from engine.variants import VariantTable
 
 
 def load_label_encoders(encoders_path: str) -> dict:
+    import joblib
     return joblib.load(encoders_path)
 
 
+def word_tokenize(text: str) -> list[str]:
+    from nltk.tokenize import word_tokenize as nltk_word_tokenize
+    return nltk_word_tokenize(text)
+
+
+def _word_to_num(text: str) -> int:
+    from word2number import w2n
+    return w2n.word_to_num(text)
+
+
 def read_text(input_path: str = None) -> str:
     if input_path and os.path.isfile(input_path):
         with open(input_path, 'r', encoding='utf-8') as f:
@@ -30,6 +38,7 @@ def read_text(input_path: str = None) -> str:
 
 
 def detect_language(text: str) -> str:
+    from langdetect import detect
     try:
         language_code = detect(text)
     except:
@@ -37,16 +46,44 @@ def detect_language(text: str) -> str:
     return language_code
 
 
+_translator = None
+_llm_client = None
+
+
+def get_translator() -> CachingTranslator:
+    global _translator
+    if _translator is None:
+        _translator = CachingTranslator(detect=detect_language)
+    return _translator
+
+
+def set_translator(translator: CachingTranslator):
+    global _translator
+    _translator = translator
+
+
+def get_llm_client() -> LLMClient:
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = LLMClient()
+    return _llm_client
+
+
+def set_llm_client(client: LLMClient):
+    global _llm_client
+    _llm_client = client
+
+
 def translate_to_english(text: str) -> str:
-    translator = Translator()
-    lang = detect(text)
-    print(f"LANG Text: {lang}")
-    result = translator.translate(text, src=lang, dest='en')
-    return result.text
+    return get_translator().translate(text)
+
 
+def translate_many_to_english(texts: list[str]) -> list[str]:
+    return get_translator().translate_many(texts)
 
-def get_stylometry_info(text: str):
-    words = word_tokenize(text)
+
+def get_stylometry_info(text: str, tokens: list[str] | None = None):
+    words = tokens if tokens is not None else word_tokenize(text)
     word_count = len(words)
     char_count = len(text)
     freqs = Counter(words)
@@ -57,13 +94,19 @@ def get_stylometry_info(text: str):
     }
 
 
-def find_word_variants(word: str):
-    """
-    synonyms, hypernyms using wordnet
-    """
+_variant_table = None
+
+
+def load_variant_table(path: str):
+    global _variant_table
+    _variant_table = VariantTable.load(path)
+
+
+@lru_cache(maxsize=8192)
+def _wordnet_variants(word: str) -> tuple:
+    from nltk.corpus import wordnet as wn
+
     variants = set()
-    if not word.isalpha():
-        return []
     synsets = wn.synsets(word, lang='eng')
     for syn in synsets:
         for lemma in syn.lemmas():
@@ -77,11 +120,24 @@ def find_word_variants(word: str):
                     variants.add(f"not {ant_lemma.name().replace('_', ' ')}")
     if word in variants:
         variants.remove(word)
-    return list(variants)
+    return tuple(variants)
 
 
-def replace_words_with_variants(text: str, ratio=0.2) -> str:
-    words = word_tokenize(text)
+def find_word_variants(word: str):
+    """
+    synonyms, hypernyms using wordnet (served from the precomputed variant table when one is loaded)
+    """
+    if not word.isalpha():
+        return []
+    if _variant_table is not None:
+        variants = _variant_table.get(word)
+        if variants is not None:
+            return variants
+    return list(_wordnet_variants(word))
+
+
+def replace_words_with_variants(text: str, ratio=0.2, tokens: list[str] | None = None) -> str:
+    words = tokens if tokens is not None else word_tokenize(text)
     if not words:
         return text
     num_to_replace = int(len(words) * ratio)
@@ -101,13 +157,15 @@ def replace_words_with_variants(text: str, ratio=0.2) -> str:
     return " ".join(new_words)
 
 
-def extract_keywords(text: str, top_n=5):
-    words = [w.lower() for w in word_tokenize(text) if w.isalpha()]
+def extract_keywords(text: str, top_n=5, tokens: list[str] | None = None):
+    words = [w.lower() for w in (tokens if tokens is not None else word_tokenize(text)) if w.isalpha()]
     freqs = Counter(words)
     return [w for w, _ in freqs.most_common(top_n)]
 
 
 def generate_sentences_for_keywords(original_text, top_n=5):
+    from rake_nltk import Rake
+
     rake_nltk_var = Rake()
 
     rake_nltk_var.extract_keywords_from_text(original_text)
@@ -116,9 +174,8 @@ def generate_sentences_for_keywords(original_text, top_n=5):
     print("\nTop Keywords:")
     print(top_keywords)
 
-    sentences = []
-    for kw in top_keywords:
-        messages = [
+    prompts = [
+        [
             {
                 "role": "system",
                 "content": "You are a helpful assistant."
@@ -128,214 +185,70 @@ def generate_sentences_for_keywords(original_text, top_n=5):
                 "content": f"Generate one meaningful sentence that includes the phrase in ROMANIAN LANGUAGE: '{kw}'.\nSentence:"
             }
         ]
+        for kw in top_keywords
+    ]
 
-        response = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=messages,
-            max_tokens=50,
-            temperature=0.7,
-            top_p=1,
-            frequency_penalty=0,
-            presence_penalty=0
-        )
-
-        sentence = response.choices[0].message["content"].strip()
-        sentences.append(sentence)
-    return sentences
+    return get_llm_client().complete_many(
+        prompts,
+        max_tokens=50,
+        temperature=0.7,
+        top_p=1,
+        frequency_penalty=0,
+        presence_penalty=0
+    )
 
 
 def parse_english_sentence_to_cat_attributes(text: str,
                                              color_encoder=None,
                                              pattern_encoder=None,
-                                             zone_encoder=None) -> dict:
-    cat_dict = {
-        'Sexe': 0,
-        'Age': 0,
-        'Nombre': 0,
-        'Logement': 0,
-        'Zone': 0,
-        'Color': 0,
-        'Pattern': 0,
-
-        'Ext': 0,
-        'Obs': 0,
-        'Timide': 0,
-        'Calme': 0,
-        'Effraye': 0,
-        'Intelligent': 0,
-        'Vigilant': 0,
-        'Perseverant': 0,
-        'Affectueux': 0,
-        'Amical': 0,
-        'Solitaire': 0,
-        'Brutal': 0,
-        'Dominant': 0,
-        'Agressif': 0,
-        'Impulsif': 0,
-        'Previsible': 0,
-        'Distrait': 0,
-
-        'Abondance': 0,
-        'PredOiseau': 0,
-        'PredMamm': 0
-    }
+                                             zone_encoder=None,
+                                             tokens: list[str] | None = None) -> dict:
+    cat_dict = {attribute: 0 for attribute in CAT_ATTRIBUTES}
 
-    attribute_synonyms = {
-        'Ext': {"extroverted", "outgoing", "sociable"},
-        'Obs': {"observant", "attentive", "watchful"},
-        'Timide': {"timid", "shy", "introverted", "bashful", "reserved"},
-        'Calme': {"calm", "peaceful", "tranquil", "serene", "relaxed"},
-        'Effraye': {"afraid", "scared", "fearful", "frightened", "terrified"},
-        'Intelligent': {"intelligent", "smart", "clever", "bright", "brainy"},
-        'Vigilant': {"vigilant", "alert", "aware", "cautious"},
-        'Perseverant': {"perseverant", "persistent", "determined", "tenacious"},
-        'Affectueux': {"affectionate", "loving", "friendly", "cuddly", "warm"},
-        'Amical': {"amiable", "amical", "friendly", "kind", "cordial"},
-        'Solitaire': {"solitary", "loner", "independent"},
-        'Brutal': {"brutal", "violent", "vicious", "savage"},
-        'Dominant': {"dominant", "bossy", "territorial", "assertive", "leader"},
-        'Agressif': {"aggressive", "hostile", "antagonistic", "belligerent"},
-        'Impulsif': {"impulsive", "rash", "hasty", "spontaneous"},
-        'Previsible': {"predictable", "foreseeable", "expected"},
-        'Distrait': {"distracted", "inattentive", "spacey", "absentminded"},
-    }
-
-    intensifiers = {
-        "slightly": -1,
-        "somewhat": -1,
-        "fairly": -1,
-        "mildly": -1,
-        "a bit": -1,
-
-        "very": +3,
-        "quite": +4,
-        "extremely": +5,
-        "incredibly": +6,
-        "remarkably": +7,
-        "truly": +8,
-        "highly": +9,
-        "super": +9,
-        "insanely": +10,
-    }
-
-    sex_synonyms = {
-        "male": 1, "boy": 1, "masculine": 1,
-        "female": 0, "girl": 0, "feminine": 0
-    }
-
-    abundance_synonyms = {
-        "scarce": 1, "limited": 1,
-        "moderate": 2, "enough": 2,
-        "plentiful": 3, "abundant": 3, "lots": 3
-    }
-    bird_synonyms = {"bird", "birds", "sparrow", "pigeon", "parrot"}
-    mamm_synonyms = {"mouse", "mice", "rat", "squirrel", "hamster"}
-
-    tokens = nltk.word_tokenize(text)
+    if tokens is None:
+        tokens = word_tokenize(text)
     lower_tokens = [t.lower() for t in tokens]
     lower_text = text.lower()
 
-    for tok in lower_tokens:
-        if tok in sex_synonyms:
-            cat_dict['Sexe'] = sex_synonyms[tok]
-            break
-
-    if color_encoder is not None:
-        color_classes = [c.lower() for c in color_encoder.classes_]
-        found_colors = [tok for tok in lower_tokens if tok in color_classes]
-        if found_colors:
-            chosen_color = found_colors[0]
-            try:
-                cat_dict['Color'] = int(color_encoder.transform([chosen_color])[0])
-            except ValueError:
-                cat_dict['Color'] = 0
-
-    if pattern_encoder is not None:
-        pattern_classes = [c.lower() for c in pattern_encoder.classes_]
-        found_patterns = [tok for tok in lower_tokens if tok in pattern_classes]
-        if found_patterns:
-            chosen_pattern = found_patterns[0]
-            try:
-                cat_dict['Pattern'] = int(pattern_encoder.transform([chosen_pattern])[0])
-            except ValueError:
-                cat_dict['Pattern'] = 0
-
-    if zone_encoder is not None:
-        zone_classes = [c.lower() for c in zone_encoder.classes_]
-        found_zones = [tok for tok in lower_tokens if tok in zone_classes]
-        if found_zones:
-            chosen_pattern = found_zones[0]
-            try:
-                cat_dict['Zone'] = int(zone_encoder.transform([chosen_pattern])[0])
-            except ValueError:
-                cat_dict['Zone'] = 0
-
-    match_age_num = re.findall(r"(\d+(?:\.\d+)?)\s*years?\s*old", lower_text)
-    if match_age_num:
-        cat_dict['Age'] = int(float(match_age_num[0]))
-
-    match_age_hyphen = re.findall(r"(\d+(?:\.\d+)?)\s*-\s*year\s*-\s*old", lower_text)
-    if match_age_hyphen:
-        cat_dict['Age'] = int(float(match_age_hyphen[0]))
-
-    match_age_text = re.findall(r"([a-zA-Z]+)\s+years?\s+old", lower_text)
-    if match_age_text:
+    lexicon = compile_lexicon(color_encoder, pattern_encoder, zone_encoder)
+    attribute_offsets = lexicon.scan(lower_tokens, cat_dict)
+
+    facts = compile_scanner().scan(lower_text)
+
+    if 'age_num' in facts:
+        cat_dict['Age'] = int(float(facts['age_num']))
+    if 'age_hyphen' in facts:
+        cat_dict['Age'] = int(float(facts['age_hyphen']))
+    if 'age_text' in facts:
         try:
-            cat_dict['Age'] = w2n.word_to_num(match_age_text[0])
+            cat_dict['Age'] = _word_to_num(facts['age_text'])
         except:
             cat_dict['Age'] = 0
 
-    attribute_offsets = defaultdict(int)
-    current_intensity = 0
-
-    for i, token in enumerate(lower_tokens):
-        if token in intensifiers:
-            current_intensity += intensifiers[token]
-            continue
-        for attr, synonyms in attribute_synonyms.items():
-            if token in synonyms:
-                attribute_offsets[attr] += current_intensity
-                current_intensity = 0
-                break
-
-    for attr in attribute_synonyms.keys():
+    for attr in ATTRIBUTE_SYNONYMS.keys():
         base_val = cat_dict[attr]
-        offset = attribute_offsets[attr]
+        offset = attribute_offsets.get(attr, 0)
         new_val = max(1, min(9, base_val + offset))
         cat_dict[attr] = new_val
 
-    if re.search(r"\blives?\s+in\s+an?\s+apartment\b", lower_text):
+    if 'apartment' in facts:
         cat_dict['Logement'] = 0
-    elif re.search(r"\blives?\s+in\s+a?\s+house\b", lower_text):
+    elif 'house' in facts:
         cat_dict['Logement'] = 2
-    elif re.search(r"\blives?\s+outdoors?\b", lower_text):
+    elif 'outdoors' in facts:
         cat_dict['Logement'] = 3
 
-
-    match_nombre_num = re.findall(r"(\d+)\s+(?:cats|companions|kittens|felines)", lower_text)
-    if match_nombre_num:
-        cat_dict['Nombre'] = int(match_nombre_num[0])
-
-    match_nombre_text = re.findall(r"([a-zA-Z]+)\s+(?:cats|companions|kittens|felines)", lower_text)
-    if match_nombre_text:
+    if 'nombre_num' in facts:
+        cat_dict['Nombre'] = int(facts['nombre_num'])
+    if 'nombre_text' in facts:
         try:
-            cat_dict['Nombre'] = w2n.word_to_num(match_nombre_text[0])
+            cat_dict['Nombre'] = _word_to_num(facts['nombre_text'])
         except:
             cat_dict['Nombre'] = 0
 
-    for tok in lower_tokens:
-        if tok in abundance_synonyms:
-            cat_dict['Abondance'] = abundance_synonyms[tok]
-
-    for tok in lower_tokens:
-        if tok in bird_synonyms:
-            cat_dict['PredOiseau'] = 1
-        if tok in mamm_synonyms:
-            cat_dict['PredMamm'] = 1
-
-    if re.search(r"hunts?\s+birds?", lower_text):
+    if 'hunts_birds' in facts:
         cat_dict['PredOiseau'] = 1
-    if re.search(r"hunts?\s+mice|rats?", lower_text):
+    if 'hunts_mammals' in facts:
         cat_dict['PredMamm'] = 1
 
     antonym_pairs = [
@@ -376,20 +289,14 @@ def describe_race(race: str):
         }
     ]
 
-    response = openai.ChatCompletion.create(
-        model="gpt-4o-mini",
-        messages=messages,
+    return get_llm_client().complete(
+        messages,
         temperature=0.7,
         top_p=1,
         frequency_penalty=0,
         presence_penalty=0
     )
 
-    sentences = []
-    for sentence in response.choices:
-        sentences.append(sentence.message["content"].strip())
-    return " ".join(sentences)
-
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Test Romanian -> English NLP pipeline for cat attributes.")
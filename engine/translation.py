@@ -0,0 +1,118 @@
+import hashlib
+import os
+import re
+from engine.constants import CACHE_DIR_PATH
+from engine.kvcache import SqliteCache
+
+TRANSLATION_CACHE_PATH = os.path.join(CACHE_DIR_PATH, "translations.sqlite3")
+BATCH_SEPARATOR = "\n\n"
+MAX_BATCH_CHARS = 4500
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class OfflineBackend:
+    """
+    Backend that never touches the network: returns the text unchanged, or the entry from `translations`.
+    """
+
+    def __init__(self, translations: dict | None = None):
+        self.translations = translations or {}
+        self.requests = 0
+
+    def translate_batch(self, texts: list[str], src: str, dest: str) -> list[str]:
+        self.requests += 1
+        return [self.translations.get(text, text) for text in texts]
+
+
+class GoogleBackend:
+    """
+    One googletrans client (and its pooled HTTP connection) reused for every request. Texts are joined into
+    requests of up to `MAX_BATCH_CHARS` characters and split back on blank lines.
+    """
+
+    def __init__(self):
+        from googletrans import Translator
+        self.translator = Translator()
+        self.requests = 0
+
+    def _translate(self, text: str, src: str, dest: str) -> str:
+        self.requests += 1
+        return self.translator.translate(text, src=src, dest=dest).text
+
+    def translate_batch(self, texts: list[str], src: str, dest: str) -> list[str]:
+        batches = [[]]
+        batch_chars = 0
+        for text in texts:
+            if batches[-1] and batch_chars + len(text) > MAX_BATCH_CHARS:
+                batches.append([])
+                batch_chars = 0
+            batches[-1].append(text)
+            batch_chars += len(text) + len(BATCH_SEPARATOR)
+
+        results = []
+        for batch in batches:
+            if not batch:
+                continue
+            translated = self._translate(BATCH_SEPARATOR.join(batch), src, dest).split(BATCH_SEPARATOR)
+            if len(translated) != len(batch):
+                translated = [self._translate(text, src, dest) for text in batch]
+            results.extend(text.strip() for text in translated)
+        return results
+
+
+class TranslationCache(SqliteCache):
+    def __init__(self, path: str = TRANSLATION_CACHE_PATH):
+        super().__init__(path, "translations")
+
+    @staticmethod
+    def key(text: str, dest: str) -> str:
+        return hashlib.sha256(f"{dest}\0{text}".encode('utf-8')).hexdigest()
+
+
+class CachingTranslator:
+    """
+    Translates through `backend`, keyed by a hash of the whitespace-normalised text, so repeated or
+    near-identical texts are translated once. Uncached texts are grouped by source language and sent in batches.
+    """
+
+    def __init__(self, backend=None, cache: TranslationCache | None = None, dest: str = 'en', detect=None):
+        self.backend = backend if backend is not None else GoogleBackend()
+        self.cache = cache if cache is not None else TranslationCache()
+        self.dest = dest
+        self.detect = detect
+
+    def translate_many(self, texts: list[str], languages: list[str] | None = None) -> list[str]:
+        normalized = [normalize_text(text) for text in texts]
+        keys = [TranslationCache.key(text, self.dest) for text in normalized]
+        translated = self.cache.get_many(list(set(keys)))
+
+        by_language = {}
+        seen = set()
+        for i, (key, text) in enumerate(zip(keys, normalized)):
+            if key in translated or key in seen:
+                continue
+            seen.add(key)
+            if languages is not None:
+                language = languages[i]
+            elif self.detect is not None:
+                language = self.detect(text)
+            else:
+                language = 'auto'
+            language = 'auto' if language == 'unknown' else language
+            by_language.setdefault(language, []).append((key, text))
+
+        new_items = {}
+        for language, items in by_language.items():
+            results = self.backend.translate_batch([text for _, text in items], language, self.dest)
+            new_items.update((key, result) for (key, _), result in zip(items, results))
+
+        if new_items:
+            self.cache.put_many(new_items)
+            translated.update(new_items)
+        return [translated[key] for key in keys]
+
+    def translate(self, text: str, language: str | None = None) -> str:
+        return self.translate_many([text], [language] if language else None)[0]
@@ -1,13 +1,150 @@
+from collections.abc import Mapping
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import LabelEncoder
+
+CATEGORICAL_COLUMNS = ["Sexe", "Age", "Race", "Abondance", "Logement", "Zone", "Nombre", "Color", "Pattern"]
+TARGET_COLUMNS = ["Race"]
+
+
+class ClassEncoder:
+    """
+    LabelEncoder-compatible (`classes_`, `transform`, `inverse_transform`) mapping backed by a dict for single
+    values and a pandas hash table for bulk encoding. Codes never change: unseen values are appended with `extend`
+    or, with `unknown='bucket'`, mapped to `unknown_code`. The bucket is the UNKNOWN class that `fit` reserves
+    right after the fitted classes, so it is stored in `classes_` and keeps its code when classes are added.
+    """
+    UNKNOWN = '<unknown>'
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes).astype(str)
+        self._codes = {value: code for code, value in enumerate(self.classes_)}
+
+    @classmethod
+    def fit(cls, values, bucket: bool = True) -> "ClassEncoder":
+        classes = np.unique(np.asarray(values).astype(str))
+        return cls(np.append(classes, cls.UNKNOWN) if bucket else classes)
+
+    @property
+    def unknown_code(self) -> int | None:
+        return self._codes.get(self.UNKNOWN)
+
+    def _bucket_code(self, unseen) -> int:
+        if self.unknown_code is None:
+            raise ValueError(f"y contains previously unseen labels: {unseen!r} (no unknown bucket)")
+        return self.unknown_code
+
+    def extend(self, values) -> list[str]:
+        added = [value for value in dict.fromkeys(str(v) for v in values) if value not in self._codes]
+        for value in added:
+            self._codes[value] = len(self._codes)
+        if added:
+            self.classes_ = np.concatenate([self.classes_, np.array(added, dtype=str)])
+        return added
+
+    def encode(self, value, unknown: str = 'error') -> int:
+        code = self._codes.get(str(value))
+        if code is not None:
+            return code
+        if unknown == 'bucket':
+            return self._bucket_code(value)
+        raise ValueError(f"y contains previously unseen labels: {value!r}")
+
+    def transform(self, values, unknown: str = 'error') -> np.ndarray:
+        values = np.asarray(values).astype(str)
+        codes = pd.Categorical(values, categories=self.classes_).codes.astype(np.int64)
+        missing = codes < 0
+        if missing.any():
+            unseen = np.unique(values[missing]).tolist()
+            if unknown != 'bucket':
+                raise ValueError(f"y contains previously unseen labels: {unseen}")
+            codes[missing] = self._bucket_code(unseen)
+        return codes
+
+    def inverse_transform(self, codes) -> np.ndarray:
+        return self.classes_[np.asarray(codes, dtype=np.int64)]
+
+
+class EncodingSchema(Mapping):
+    """
+    Frozen column -> ClassEncoder mapping for the categorical columns. It is stored next to the weights as
+    `classes_<column>` arrays, so the model and its encoding always travel together.
+    """
+
+    def __init__(self, encoders: dict):
+        self._encoders = dict(encoders)
+
+    def __getitem__(self, column: str) -> ClassEncoder:
+        return self._encoders[column]
+
+    def __iter__(self):
+        return iter(self._encoders)
+
+    def __len__(self) -> int:
+        return len(self._encoders)
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame, columns: list[str] = CATEGORICAL_COLUMNS,
+            target_columns: list[str] = TARGET_COLUMNS) -> "EncodingSchema":
+        return cls({col: ClassEncoder.fit(df[col], bucket=col not in target_columns) for col in columns})
+
+    @classmethod
+    def from_classes(cls, classes: dict) -> "EncodingSchema":
+        return cls({col: ClassEncoder(values) for col, values in classes.items()})
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "EncodingSchema":
+        return cls.from_classes({name[len('classes_'):]: arrays[name] for name in arrays
+                                 if name.startswith('classes_')})
+
+    def to_arrays(self) -> dict:
+        return {f'classes_{col}': encoder.classes_ for col, encoder in self._encoders.items()}
+
+    def encode(self, df: pd.DataFrame, unknown: str = 'error') -> pd.DataFrame:
+        df = df.copy()
+        for col, encoder in self._encoders.items():
+            if col in df.columns:
+                df[col] = encoder.transform(df[col].values, unknown)
+        return df
+
+    def decode(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.copy()
+        for col, encoder in self._encoders.items():
+            if col in df.columns:
+                df[col] = encoder.inverse_transform(df[col].values)
+        return df
+
+    def encode_row(self, row: dict, unknown: str = 'error') -> dict:
+        return {col: self._encoders[col].encode(value, unknown) if col in self._encoders else value
+                for col, value in row.items()}
+
+    def extended(self, df: pd.DataFrame) -> tuple["EncodingSchema", dict]:
+        encoders, added = {}, {}
+        for col, encoder in self._encoders.items():
+            encoders[col] = ClassEncoder(encoder.classes_)
+            if col in df.columns:
+                new_values = encoders[col].extend(df[col].dropna())
+                if new_values:
+                    added[col] = new_values
+        return EncodingSchema(encoders), added
 
 
 def transform_non_numeric(df: pd.DataFrame):
-    label_encoders = {}
+    schema = EncodingSchema.fit(df)
+    return schema.encode(df), schema
+
 
-    for col in ["Sexe", "Age", "Race", "Abondance", "Logement", "Zone", "Nombre", "Color", "Pattern"]:
-        le = LabelEncoder()
-        df[col] = le.fit_transform(df[col])
-        label_encoders[col] = le
+def transform_with_encoders(df: pd.DataFrame, label_encoders: dict):
+    """
+    Encodes `df` with an existing schema, extending it with values it has not seen yet. Missing values are
+    never added as classes: impute them first.
+    """
+    missing = [col for col in label_encoders if col in df.columns and df[col].isna().any()]
+    if missing:
+        raise ValueError(f"Missing values in {missing}; impute them before encoding")
+    schema = label_encoders if isinstance(label_encoders, EncodingSchema) else EncodingSchema.from_classes(
+        {col: encoder.classes_ for col, encoder in label_encoders.items()})
+    schema, added = schema.extended(df)
+    for col, values in added.items():
+        print(f"New values for {col}: {values}")
 
-    return df, label_encoders
+    return schema.encode(df), schema
@@ -0,0 +1,69 @@
+import argparse
+import os
+import re
+import numpy as np
+
+WORDS_FILE = "words.npy"
+OFFSETS_FILE = "offsets.npy"
+VARIANTS_FILE = "variants.npy"
+
+
+class VariantTable:
+    """
+    Precomputed word -> variants table stored as three `.npy` files (sorted words, offsets, flattened variants)
+    that are memory-mapped on load, so lookups need neither the WordNet corpus nor a full read of the table.
+    """
+
+    def __init__(self, words: np.ndarray, offsets: np.ndarray, variants: np.ndarray):
+        self.words = words
+        self.offsets = offsets
+        self.variants = variants
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def get(self, word: str) -> list[str] | None:
+        key = word.encode('utf-8')
+        position = int(np.searchsorted(self.words, key))
+        if position == len(self.words) or self.words[position] != key:
+            return None
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return [variant.decode('utf-8') for variant in self.variants[start:end]]
+
+    @staticmethod
+    def build(vocabulary, lookup, path: str) -> "VariantTable":
+        words = sorted({word for word in vocabulary if word.isalpha()})
+        offsets = [0]
+        variants = []
+        for word in words:
+            variants.extend(lookup(word))
+            offsets.append(len(variants))
+
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, WORDS_FILE), np.array([w.encode('utf-8') for w in words], dtype=bytes))
+        np.save(os.path.join(path, OFFSETS_FILE), np.array(offsets, dtype=np.int64))
+        np.save(os.path.join(path, VARIANTS_FILE), np.array([v.encode('utf-8') for v in variants], dtype=bytes))
+        return VariantTable.load(path)
+
+    @staticmethod
+    def load(path: str) -> "VariantTable":
+        return VariantTable(*(np.load(os.path.join(path, name), mmap_mode='r')
+                              for name in (WORDS_FILE, OFFSETS_FILE, VARIANTS_FILE)))
+
+
+if __name__ == "__main__":
+    from engine.text_processing import find_word_variants
+
+    parser = argparse.ArgumentParser(description="Precompute WordNet variants for the vocabulary of some texts.")
+    parser.add_argument("--texts", nargs="+", required=True, help="Text/JSONL files to take the vocabulary from")
+    parser.add_argument("--output", default="variants_table", help="Output directory")
+
+    args = parser.parse_args()
+
+    vocabulary = set()
+    for text_path in args.texts:
+        with open(text_path, 'r', encoding='utf-8') as f:
+            vocabulary.update(re.findall(r"[a-z]+", f.read().lower()))
+
+    table = VariantTable.build(vocabulary, find_word_variants, args.output)
+    print(f"Variant table with {len(table)} words written to {args.output}")
@@ -1,17 +1,32 @@
-from engine.constants import DATASET_PATH
-from engine.processing import process_dataset
-from engine.statistics import instances_per_class, df_value_frequency, plot_attributes_frequencies, behavioral_stats
-from engine.plots import df_correlation
-from engine.utils import transform_non_numeric
-from pprint import pprint
-from mlp.model import MLPModel
-import matplotlib.pyplot as plt
-from engine.text_processing import read_text, translate_to_english, parse_english_sentence_to_cat_attributes, replace_words_with_variants, get_stylometry_info, extract_keywords, generate_sentences_for_keywords, describe_race
-import numpy as np
+import argparse
+import json
+import sys
 
+STARTUP_MODULES = ["engine.text_processing", "engine.processing", "mlp.model", "mlp.inference"]
 
-if __name__ == "__main__":
-    df = process_dataset(DATASET_PATH, use_smote=True)
+
+def classify_attributes(attributes: str, model_path: str):
+    from mlp.inference import InferenceModel
+
+    rows = json.loads(attributes)
+    model = InferenceModel.load(model_path)
+    for race in model.predict(rows if isinstance(rows, list) else [rows]):
+        print(race)
+
+
+def run_interactive():
+    from engine.config import RunConfig
+    from engine.constants import DATASET_PATH
+    from engine.processing import process_dataset
+    from engine.statistics import instances_per_class, df_value_frequency, plot_attributes_frequencies, behavioral_stats
+    from engine.plots import df_correlation
+    from engine.utils import transform_non_numeric
+    from pprint import pprint
+    from mlp.model import MLPModel
+    from engine.text_processing import read_text, word_tokenize, translate_to_english, parse_english_sentence_to_cat_attributes, replace_words_with_variants, get_stylometry_info, extract_keywords, generate_sentences_for_keywords, describe_race
+
+    config = RunConfig()
+    df = process_dataset(DATASET_PATH, **config.dataset_kwargs())
     df, label_encoders = transform_non_numeric(df)
 
     # import joblib
@@ -38,13 +53,14 @@ if __name__ == "__main__":
 
     # df_correlation(df)
 
-    model = MLPModel(df, 100, 0.1, 200)
+    model = MLPModel(df, race_encoder=label_encoders["Race"], **config.model_kwargs())
     try:
         model.load_model()
     except Exception as e:
         print(f"No pre-trained model! Error: {e}")
         print("Training...")
-        model.train(50)
+        model.train(config.batch_size)
+    model.export_inference_model(label_encoders)
 
     print(f"Best accuracy: {model.best_accuracy * 100:.2f} ")
 
@@ -55,13 +71,15 @@ if __name__ == "__main__":
     print("\nTranslated:")
     print(english_text)
 
-    info = get_stylometry_info(english_text)
+    tokens = word_tokenize(english_text)
+
+    info = get_stylometry_info(english_text, tokens)
     print("\nStylometry Info")
     print(f"Word count: {info['word_count']}")
     print(f"Char count: {info['char_count']}")
     print(f"Most common words: {info['freqs'].most_common(5)}")
 
-    alt_text = replace_words_with_variants(english_text, ratio=0.2)
+    alt_text = replace_words_with_variants(english_text, ratio=0.2, tokens=tokens)
     print("\nAlternative text - 20% replaced:")
     print(alt_text)
 
@@ -78,48 +96,32 @@ if __name__ == "__main__":
         english_text,
         color_encoder=color_encoder,
         pattern_encoder=pattern_encoder,
-        zone_encoder=zone_encoder
+        zone_encoder=zone_encoder,
+        tokens=tokens
     )
     print("\n[Parsed cat attributes]")
     pprint(cat_attributes)
 
-    test_vector = [
-        cat_attributes['Sexe'],
-        cat_attributes['Age'],
-        cat_attributes['Nombre'],
-        cat_attributes['Logement'],
-        cat_attributes['Zone'],
-        cat_attributes['Ext'],
-        cat_attributes['Obs'],
-        cat_attributes['Timide'],
-        cat_attributes['Calme'],
-        cat_attributes['Effraye'],
-        cat_attributes['Intelligent'],
-        cat_attributes['Vigilant'],
-        cat_attributes['Perseverant'],
-        cat_attributes['Affectueux'],
-        cat_attributes['Amical'],
-        cat_attributes['Solitaire'],
-        cat_attributes['Brutal'],
-        cat_attributes['Dominant'],
-        cat_attributes['Agressif'],
-        cat_attributes['Impulsif'],
-        cat_attributes['Previsible'],
-        cat_attributes['Distrait'],
-        cat_attributes['Abondance'],
-        cat_attributes['PredOiseau'],
-        cat_attributes['PredMamm'],
-        cat_attributes['Color'],
-        cat_attributes['Pattern']
-    ]
-    test_vector = np.array(test_vector).reshape(1, -1)
-
-    _, _, predictions = model._forward_propagation(test_vector)
-    predicted_race_idx = np.argmax(predictions, axis=1)[0]
-
-    race_encoder = label_encoders["Race"]
-    predicted_race_label = race_encoder.inverse_transform([predicted_race_idx])[0]
+    predicted_race_label = model.predict([cat_attributes])[0]
 
     print(f"\nPREDICTED RACE for this cat: {predicted_race_label}")
 
     print(f"Description of the race: {predicted_race_label}: {describe_race(predicted_race_label)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Catology: classify a cat's breed from a description.")
+    parser.add_argument("--attributes", help="JSON attribute dict (or list of dicts) to classify directly; '-' reads stdin")
+    parser.add_argument("--model", default="mlp_model.npz", help="Inference artifact used with --attributes")
+    parser.add_argument("--startup-report", action="store_true", help="Print per-package import cost and exit")
+
+    args = parser.parse_args()
+
+    if args.startup_report:
+        from engine.profiling import print_import_profile
+        for module in STARTUP_MODULES:
+            print_import_profile([module])
+    elif args.attributes:
+        classify_attributes(sys.stdin.read() if args.attributes == "-" else args.attributes, args.model)
+    else:
+        run_interactive()
@@ -1,7 +1,10 @@
 import numpy as np
+from engine.constants import CAT_ATTRIBUTES
 
 
 class BaseModel:
+    feature_names = np.array(CAT_ATTRIBUTES)
+
     @staticmethod
     def _softmax(input):
         exp = np.exp(input - np.max(input, axis=1, keepdims=True))
@@ -14,12 +17,42 @@ class BaseModel:
         return np.maximum(0, input)
 
     @staticmethod
-    def _cross_entropy_loss(predictions, targets):
+    def _cross_entropy_loss(predictions, targets, class_weights=None):
         size = predictions.shape[0]
         result = -np.log(predictions[range(size), targets])
+        if class_weights is not None:
+            result *= class_weights[targets]
         loss = np.sum(result) / size
         return loss
 
+    @staticmethod
+    def _class_weights(labels, classes: int) -> np.ndarray:
+        counts = np.bincount(labels, minlength=classes)
+        return np.where(counts > 0, len(labels) / (classes * np.maximum(counts, 1)), 0.0)
+
     @staticmethod
     def _accuracy(predictions, labels):
         return np.mean(np.argmax(predictions, axis=1) == labels)
+
+    def _to_matrix(self, inputs) -> np.ndarray:
+        if isinstance(inputs, dict):
+            inputs = [inputs]
+        if isinstance(inputs, list) and inputs and isinstance(inputs[0], dict):
+            inputs = [[row[name] for name in self.feature_names] for row in inputs]
+        data = np.asarray(inputs, dtype=np.float64)
+        if data.ndim == 1:
+            data = data.reshape(1, -1)
+        return data
+
+    def _decode_races(self, indices: np.ndarray) -> np.ndarray:
+        return indices
+
+    def predict_proba(self, inputs, batch_size: int = 4096) -> np.ndarray:
+        data = self._to_matrix(inputs)
+        probabilities = np.empty((data.shape[0], self.output_size))
+        for i in range(0, data.shape[0], batch_size):
+            probabilities[i:i + batch_size] = self._forward_propagation(data[i:i + batch_size])
+        return probabilities
+
+    def predict(self, inputs, batch_size: int = 4096) -> np.ndarray:
+        return self._decode_races(np.argmax(self.predict_proba(inputs, batch_size), axis=1))
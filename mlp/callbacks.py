@@ -0,0 +1,120 @@
+import numpy as np
+
+
+class Callback:
+    """
+    Hooks called by `MLPModel.train`. `on_epoch_end` receives the epoch logs ('epoch', 'loss', and on evaluated
+    epochs 'accuracy' and 'improved'); returning True stops training.
+    """
+
+    def on_train_begin(self, model):
+        pass
+
+    def on_epoch_end(self, model, logs: dict) -> bool | None:
+        return None
+
+    def on_train_end(self, model):
+        pass
+
+
+class ReduceLROnPlateau(Callback):
+    def __init__(self, patience: int = 10, factor: float = 0.5, min_learning_rate: float = 1e-3):
+        self.patience = patience
+        self.factor = factor
+        self.min_learning_rate = min_learning_rate
+        self.counter = 0
+
+    def on_train_begin(self, model):
+        self.counter = 0
+
+    def on_epoch_end(self, model, logs: dict) -> bool | None:
+        if 'accuracy' not in logs:
+            return None
+        if logs['improved']:
+            self.counter = 0
+            return None
+
+        self.counter += 1
+        if self.counter < self.patience:
+            return None
+
+        self.counter = 0
+        model.learning_rate *= self.factor
+        model.optimizer.learning_rate = model.learning_rate
+        if model.verbose:
+            print(f"Learning rate reduced to: {model.learning_rate}")
+        if model.learning_rate < self.min_learning_rate:
+            if model.verbose:
+                print(f"Learning rate too low. Stopping...")
+            return True
+        return None
+
+
+class EarlyStopping(Callback):
+    def __init__(self, patience: int = 20, min_delta: float = 0.0):
+        self.patience = patience
+        self.min_delta = min_delta
+        self.best = -np.inf
+        self.counter = 0
+
+    def on_train_begin(self, model):
+        self.best = -np.inf
+        self.counter = 0
+
+    def on_epoch_end(self, model, logs: dict) -> bool | None:
+        if 'accuracy' not in logs:
+            return None
+        if logs['accuracy'] > self.best + self.min_delta:
+            self.best = logs['accuracy']
+            self.counter = 0
+            return None
+
+        self.counter += 1
+        if self.counter >= self.patience:
+            if model.verbose:
+                print(f"No improvement for {self.patience} evaluations. Stopping...")
+            return True
+        return None
+
+
+class BestWeights(Callback):
+    """
+    Copies the parameters into preallocated buffers whenever accuracy improves; the snapshot is written to
+    `save_path` every `flush_every` epochs (if it changed) and once when training ends.
+    """
+
+    def __init__(self, save_path: str | None = None, flush_every: int | None = None, restore: bool = False):
+        self.save_path = save_path
+        self.flush_every = flush_every
+        self.restore = restore
+        self.snapshot = None
+        self.dirty = False
+        self.has_snapshot = False
+
+    def on_train_begin(self, model):
+        self.snapshot = [np.empty_like(param) for param in model._parameters()]
+        self.dirty = False
+        self.has_snapshot = False
+
+    def on_epoch_end(self, model, logs: dict) -> bool | None:
+        if logs.get('improved'):
+            for buffer, param in zip(self.snapshot, model._parameters()):
+                np.copyto(buffer, param)
+            self.dirty = True
+            self.has_snapshot = True
+
+        if self.flush_every and logs['epoch'] % self.flush_every == 0:
+            self._flush(model)
+        return None
+
+    def on_train_end(self, model):
+        self._flush(model)
+        if self.restore and self.has_snapshot:
+            for param, buffer in zip(model._parameters(), self.snapshot):
+                np.copyto(param, buffer)
+
+    def _flush(self, model):
+        if self.save_path is None or not self.dirty:
+            return
+        model.save_model(self.save_path, list(zip(self.snapshot[::2], self.snapshot[1::2])))
+        self.dirty = False
@@ -0,0 +1,117 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from mlp.model import MLPModel
+from mlp.trials import share_arrays, attach_arrays, shared_array, release_arrays, model_kwargs, train_trial
+
+
+def stratified_folds(labels: np.ndarray, k: int = 5, seed: int = 0) -> np.ndarray:
+    """
+    Fold index of every row: each class is shuffled and dealt round-robin (from a random starting fold), so all
+    folds get the same class proportions up to one row per class.
+    """
+    rng = np.random.default_rng(seed)
+    folds = np.empty(len(labels), dtype=np.int64)
+    for label in np.unique(labels):
+        rows = rng.permutation(np.flatnonzero(labels == label))
+        folds[rows] = (np.arange(len(rows)) + rng.integers(k)) % k
+    return folds
+
+
+def _run_fold(config: dict, fold: int, seed: int, batch_size: int, output_size: int) -> dict:
+    folds = shared_array('folds')
+    model = MLPModel.from_rows(shared_array('data'), shared_array('labels'), np.flatnonzero(folds != fold),
+                               np.flatnonzero(folds == fold), output_size, seed=seed, **model_kwargs(config))
+    result = train_trial(model, config, seed, batch_size)
+    result['fold'] = fold
+    return result
+
+
+def _summarize(config: dict, fold_results: list[dict]) -> dict:
+    accuracies = np.array([result['accuracy'] for result in fold_results])
+    best_accuracies = np.array([result['best_accuracy'] for result in fold_results])
+    train_times = np.array([result['train_time'] for result in fold_results])
+    return {
+        'config': config,
+        'folds': sorted(fold_results, key=lambda result: result['fold']),
+        'mean_accuracy': accuracies.mean(),
+        'std_accuracy': accuracies.std(ddof=1) if len(accuracies) > 1 else 0.0,
+        'mean_best_accuracy': best_accuracies.mean(),
+        'mean_train_time': train_times.mean(),
+    }
+
+
+def cross_validate_configs(arrays: dict, configs: list[dict], k: int = 5, seed: int = 0, batch_size: int = 100,
+                           workers: int | None = None) -> list[dict]:
+    """
+    Stratified k-fold over `arrays` ('data', 'labels') for every config. All (config, fold) pairs share one
+    process pool and one shared-memory copy of the data; results are ranked by mean final test-fold accuracy.
+    """
+    labels = np.asarray(arrays['labels'], dtype=np.int64)
+    output_size = int(labels.max()) + 1
+    shared = {'data': np.asarray(arrays['data'], dtype=np.float64), 'labels': labels,
+              'folds': stratified_folds(labels, k, seed)}
+
+    blocks, specs = share_arrays(shared)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=attach_arrays, initargs=(specs,)) as executor:
+            futures = [[executor.submit(_run_fold, config, fold, seed + fold, batch_size, output_size)
+                        for fold in range(k)] for config in configs]
+            results = [_summarize(config, [future.result() for future in config_futures])
+                       for config, config_futures in zip(configs, futures)]
+    finally:
+        release_arrays(blocks)
+    return sorted(results, key=lambda result: result['mean_accuracy'], reverse=True)
+
+
+def cross_validate(arrays: dict, config: dict, k: int = 5, seed: int = 0, batch_size: int = 100,
+                   workers: int | None = None) -> dict:
+    start = time.perf_counter()
+    result = cross_validate_configs(arrays, [config], k, seed, batch_size, workers)[0]
+    result['wall_time'] = time.perf_counter() - start
+    return result
+
+
+def print_report(result: dict):
+    print(f"{'fold':>4} {'acc':>8} {'best acc':>9} {'epochs':>6} {'time (s)':>9}")
+    for fold in result['folds']:
+        print(f"{fold['fold']:>4} {fold['accuracy'] * 100:>7.2f}% {fold['best_accuracy'] * 100:>8.2f}% "
+              f"{fold['epochs_run']:>6} {fold['train_time']:>9.2f}")
+    print(f"Accuracy: {result['mean_accuracy'] * 100:.2f}% ± {result['std_accuracy'] * 100:.2f}% "
+          f"(best per fold: {result['mean_best_accuracy'] * 100:.2f}%)")
+    if 'wall_time' in result:
+        print(f"Wall time: {result['wall_time']:.2f}s, mean fold time: {result['mean_train_time']:.2f}s")
+
+
+def load_dataset_arrays(use_smote: bool = False, balance: bool = False, seed: int = 0) -> dict:
+    from engine.constants import DATASET_PATH
+    from engine.processing import process_dataset
+    from engine.utils import transform_non_numeric
+
+    df, _ = transform_non_numeric(process_dataset(DATASET_PATH, use_smote=use_smote, seed=seed, balance=balance))
+    return {'data': df.drop(columns=["Race"]).values.astype(np.float64),
+            'labels': df["Race"].values.astype(np.int64)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stratified k-fold cross-validation of an MLPModel configuration.")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--hidden-size", type=int, nargs="+", default=[100])
+    parser.add_argument("--learning-rate", type=float, default=0.1)
+    parser.add_argument("--epochs", type=int, default=100)
+    parser.add_argument("--class-weights", choices=["loss", "sampling"], default=None)
+    parser.add_argument("--balance", action="store_true",
+                        help="Oversample before splitting (copies of a row can land in different folds)")
+
+    args = parser.parse_args()
+
+    data = load_dataset_arrays(balance=args.balance, seed=args.seed)
+    hidden_size = args.hidden_size[0] if len(args.hidden_size) == 1 else args.hidden_size
+    config = {'hidden_size': hidden_size, 'learning_rate': args.learning_rate, 'epochs': args.epochs,
+              'class_weights': args.class_weights}
+    print_report(cross_validate(data, config, args.folds, args.seed, args.batch_size, args.workers))
@@ -0,0 +1,61 @@
+import argparse
+import os
+from engine.config import RunConfig
+from engine.constants import DATASET_PATH
+from engine.processing import process_dataset, dataset_fill_values, update_statistics
+from engine.utils import transform_non_numeric, transform_with_encoders
+from mlp.model import MLPModel
+
+
+def create_checkpoint(checkpoint_path: str, config: RunConfig = RunConfig()) -> MLPModel:
+    df, label_encoders = transform_non_numeric(process_dataset(DATASET_PATH, **config.dataset_kwargs()))
+    model = MLPModel(df, race_encoder=label_encoders['Race'], **config.model_kwargs())
+    model.fill_values = dataset_fill_values(DATASET_PATH)
+    model.train(config.batch_size, save_path=None, show_plot=False)
+    model.save_checkpoint(label_encoders, checkpoint_path)
+    return model
+
+
+def update_checkpoint(checkpoint_path: str, rows_csv_path: str, epochs: int = 5, batch_size: int = 50,
+                      seed: int = 42, export_path: str | None = 'mlp_model.npz',
+                      statistics_path: str | None = None) -> float:
+    """
+    Fine-tunes a checkpoint on new survey rows (same CSV layout as the dataset) instead of retraining from
+    scratch, then overwrites the checkpoint and re-exports the inference artifact. When `statistics_path` is
+    given, the raw rows are also folded into the accumulated dataset statistics. Missing values are imputed with
+    the training-set fill values stored in the checkpoint, not with statistics of the new batch.
+    """
+    model, label_encoders = MLPModel.load_checkpoint(checkpoint_path)
+    if model.fill_values is None:
+        model.fill_values = dataset_fill_values(DATASET_PATH)
+
+    df = process_dataset(rows_csv_path, seed=seed, balance=False, fill_values=model.fill_values)
+    df, label_encoders = transform_with_encoders(df, label_encoders)
+    model.race_encoder = label_encoders['Race']
+
+    accuracy = model.fine_tune(df, epochs, batch_size)
+    model.save_checkpoint(label_encoders, checkpoint_path)
+    if export_path is not None:
+        model.export_inference_model(label_encoders, export_path)
+    if statistics_path is not None:
+        update_statistics(statistics_path, rows_csv_path)
+    return accuracy
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm-start training of the MLP from new survey rows.")
+    parser.add_argument("--checkpoint", default="mlp_checkpoint.npz")
+    parser.add_argument("--rows", help="CSV with the new survey rows")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--export", default="mlp_model.npz")
+    parser.add_argument("--statistics", default=None, help="Dataset statistics file to update with the new rows")
+
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.checkpoint):
+        create_checkpoint(args.checkpoint)
+    if args.rows:
+        accuracy = update_checkpoint(args.checkpoint, args.rows, args.epochs, args.batch_size,
+                                     export_path=args.export, statistics_path=args.statistics)
+        print(f"Accuracy after fine-tuning: {accuracy * 100:.2f}%")
@@ -0,0 +1,35 @@
+import numpy as np
+from mlp.base import BaseModel
+
+
+class InferenceModel(BaseModel):
+    """
+    Forward-only MLP restored from an `.npz` artifact written by `MLPModel.export_inference_model`.
+    Loading needs only NumPy: no pandas, sklearn, pickle or the training dataset.
+    """
+
+    def __init__(self, weights: list, biases: list, feature_names: np.ndarray, classes: dict):
+        self.weights = weights
+        self.biases = biases
+        self.feature_names = feature_names
+        self.classes = classes
+        self.output_size = weights[-1].shape[1]
+
+    @classmethod
+    def load(cls, filename='mlp_model.npz') -> "InferenceModel":
+        with np.load(filename, allow_pickle=False) as artifact:
+            layers = sum(1 for name in artifact.files if name.startswith('weights_'))
+            weights = [artifact[f'weights_{i}'] for i in range(layers)]
+            biases = [artifact[f'bias_{i}'] for i in range(layers)]
+            classes = {name[len('classes_'):]: artifact[name] for name in artifact.files if name.startswith('classes_')}
+            feature_names = artifact['feature_names']
+        return cls(weights, biases, feature_names, classes)
+
+    def _forward_propagation(self, data):
+        output = data
+        for weights, bias in zip(self.weights[:-1], self.biases[:-1]):
+            output = super()._relu_activation(np.dot(output, weights) + bias)
+        return super()._softmax(np.dot(output, self.weights[-1]) + self.biases[-1])
+
+    def _decode_races(self, indices: np.ndarray) -> np.ndarray:
+        return self.classes['Race'][indices]
@@ -0,0 +1,57 @@
+import numpy as np
+
+
+class DenseLayer:
+    """
+    Fully connected layer with a fused activation (ReLU for hidden layers, softmax for the output layer).
+    The forward pass keeps its input and output as caches for the backward pass and reuses the output buffer
+    while the batch size stays the same.
+    """
+
+    def __init__(self, input_size: int, output_size: int, activation: str = 'relu', dtype=np.float64,
+                 rng: np.random.Generator | None = None):
+        rng = rng if rng is not None else np.random.default_rng()
+        self.activation = activation
+        self.weights = (rng.standard_normal((input_size, output_size)) * np.sqrt(2. / input_size)).astype(dtype)
+        self.bias = np.zeros(output_size, dtype=dtype)
+        self.grad_weights = np.empty_like(self.weights)
+        self.grad_bias = np.empty_like(self.bias)
+        self.input = None
+        self.output = None
+
+    def parameters(self) -> list:
+        return [self.weights, self.bias]
+
+    def gradients(self) -> list:
+        return [self.grad_weights, self.grad_bias]
+
+    def forward(self, data: np.ndarray) -> np.ndarray:
+        rows = data.shape[0]
+        if self.output is None or self.output.shape[0] != rows or self.output.dtype != np.result_type(data, self.weights):
+            self.output = np.empty((rows, self.weights.shape[1]), dtype=np.result_type(data, self.weights))
+
+        self.input = data
+        output = np.dot(data, self.weights, out=self.output)
+        output += self.bias
+
+        if self.activation == 'relu':
+            np.maximum(output, 0, out=output)
+        elif self.activation == 'softmax':
+            output -= np.max(output, axis=1, keepdims=True)
+            np.exp(output, out=output)
+            output /= np.sum(output, axis=1, keepdims=True)
+        return output
+
+    def backward(self, delta: np.ndarray, propagate: bool = True) -> np.ndarray | None:
+        """
+        `delta` is the loss gradient w.r.t. this layer's pre-activation. Returns the same quantity for the
+        previous layer (already masked by its ReLU), or None when `propagate` is False.
+        """
+        np.dot(self.input.T, delta, out=self.grad_weights)
+        np.sum(delta, axis=0, out=self.grad_bias)
+
+        if not propagate:
+            return None
+        previous = np.dot(delta, self.weights.T)
+        previous *= self.input > 0
+        return previous
@@ -1,68 +1,145 @@
+import json
 import pickle
 import numpy as np
-import time
-from sklearn.model_selection import train_test_split
 import pandas as pd
-from sklearn.utils import shuffle
 from mlp.base import BaseModel
-import matplotlib.pyplot as plt
+from mlp.callbacks import Callback, ReduceLROnPlateau, BestWeights
+from mlp.layers import DenseLayer
+from mlp.optimizers import Optimizer, SGD, OPTIMIZER_CLASSES
+from engine.utils import EncodingSchema
 
 
 class MLPModel(BaseModel):
     offset = 10
     reduce = 0.5
     best_accuracy: int = 0
-    losses = []
+    test_size = 0.2
+    fill_values = None
+    train_rows = None
+    test_rows = None
+
+    def __init__(self, df: pd.DataFrame, hidden_size: int | list[int] = 100, learning_rate: float = 0.001,
+                 epochs: int = 500, race_encoder=None, dtype=np.float64, seed: int | None = None,
+                 test_size: float = 0.2, class_weights: str | None = None):
+        from sklearn.model_selection import train_test_split
 
-    def __init__(self, df: pd.DataFrame, hidden_size: int = 100, learning_rate: float = 0.001, epochs: int = 500):
         target_column = 'Race'
-        x = df.drop(columns=["Race"]).values
+        x = df.drop(columns=["Race"]).values.astype(dtype)
         y = df[target_column].astype('category').cat.codes.values
 
-        self.train_data, self.test_data, self.train_labels, self.test_labels = train_test_split(x, y, test_size=0.2)
+        sequence = np.random.SeedSequence(seed)
+        split_seed = int(sequence.spawn(1)[0].generate_state(1)[0])
+        train_data, test_data, train_labels, test_labels = train_test_split(x, y, test_size=test_size,
+                                                                            random_state=split_seed)
+        self.test_size = test_size
+        self._setup(train_data, test_data, train_labels, test_labels, len(np.unique(y)), hidden_size, learning_rate,
+                    epochs, race_encoder, dtype, sequence.entropy, class_weights)
+
+    @classmethod
+    def from_split(cls, train_data, test_data, train_labels, test_labels, output_size: int,
+                   hidden_size: int | list[int] = 100, learning_rate: float = 0.001, epochs: int = 500,
+                   race_encoder=None, dtype=np.float64, seed: int | None = None,
+                   class_weights: str | None = None) -> "MLPModel":
+        model = cls.__new__(cls)
+        model._setup(train_data, test_data, train_labels, test_labels, output_size, hidden_size, learning_rate,
+                     epochs, race_encoder, dtype, seed, class_weights)
+        return model
+
+    @classmethod
+    def from_rows(cls, data, labels, train_rows, test_rows, output_size: int, hidden_size: int | list[int] = 100,
+                  learning_rate: float = 0.001, epochs: int = 500, race_encoder=None, dtype=np.float64,
+                  seed: int | None = None, class_weights: str | None = None) -> "MLPModel":
+        """
+        Trains and evaluates on the `train_rows`/`test_rows` of `data` without copying them out: batches are
+        gathered from `data` (which may be a read-only shared array) as they are needed.
+        """
+        model = cls.from_split(data, data, labels, labels, output_size, hidden_size, learning_rate, epochs,
+                               race_encoder, dtype, seed, class_weights)
+        model.train_rows = np.asarray(train_rows, dtype=np.int64)
+        model.test_rows = np.asarray(test_rows, dtype=np.int64)
+        return model
+
+    def _setup(self, train_data, test_data, train_labels, test_labels, output_size, hidden_size, learning_rate,
+               epochs, race_encoder, dtype, seed, class_weights=None):
+        if class_weights not in (None, 'loss', 'sampling'):
+            raise ValueError(f"Unknown class_weights mode: {class_weights}")
+        self.dtype = np.dtype(dtype)
+        self.train_data = np.asarray(train_data, dtype=self.dtype)
+        self.test_data = np.asarray(test_data, dtype=self.dtype)
+        self.train_labels = train_labels
+        self.test_labels = test_labels
 
         self.input_size = self.train_data.shape[1]
-        self.hidden_size = hidden_size
-        self.output_size = len(np.unique(y))
+        self.hidden_sizes = [hidden_size] if isinstance(hidden_size, int) else list(hidden_size)
+        self.hidden_size = self.hidden_sizes[0]
+        self.output_size = output_size
         self.learning_rate = learning_rate
         self.epochs = epochs
+        self.race_encoder = race_encoder
+        self.class_weights = class_weights
+        self.history = {'loss': [], 'accuracy': [], 'eval_epochs': []}
+        self.losses = self.history['loss']
+        self.accuracies = self.history['accuracy']
+        self.epochs_run = 0
+        self.verbose = True
 
-        np.random.seed(int(time.time()))
-        self.weights_hidden = np.random.randn(self.input_size, hidden_size) * np.sqrt(2. / self.input_size)
-        self.bias_hidden = np.zeros(hidden_size)
-        self.weights_output = np.random.randn(hidden_size, self.output_size) * np.sqrt(2. / hidden_size)
-        self.bias_output = np.zeros(self.output_size)
+        sequence = np.random.SeedSequence(seed)
+        self.seed = sequence.entropy
+        _, init_sequence, shuffle_sequence = sequence.spawn(3)
+        self.rng = np.random.default_rng(shuffle_sequence)
+        self.layers = self._build_layers(np.random.default_rng(init_sequence))
+
+    def _build_layers(self, rng: np.random.Generator | None = None) -> list[DenseLayer]:
+        sizes = [self.input_size] + self.hidden_sizes + [self.output_size]
+        layers = [DenseLayer(sizes[i], sizes[i + 1], 'relu', self.dtype, rng) for i in range(len(sizes) - 2)]
+        layers.append(DenseLayer(sizes[-2], sizes[-1], 'softmax', self.dtype, rng))
+        return layers
+
+    def _parameters(self) -> list:
+        return [param for layer in self.layers for param in layer.parameters()]
+
+    def _gradients(self) -> list:
+        return [grad for layer in self.layers for grad in layer.gradients()]
 
     def _forward_propagation(self, data):
-        hidden_layer_input = np.dot(data, self.weights_hidden) + self.bias_hidden
-        hidden_layer_output = super()._relu_activation(hidden_layer_input, False)
+        output = data
+        for layer in self.layers:
+            output = layer.forward(output)
+        return output
 
-        out_layer = np.dot(hidden_layer_output, self.weights_output) + self.bias_output
-        predictions = super()._softmax(out_layer)
-        return hidden_layer_input, hidden_layer_output, predictions
+    def _backward_propagation(self, labels, predictions, sample_weights=None):
+        batch_size = predictions.shape[0]
 
-    def _backward_propagation(self, data, labels, hidden_layer_input, hidden_layer_output, predictions):
-        batch_size = data.shape[0]
+        delta = predictions
+        delta[range(batch_size), labels] -= 1
+        if sample_weights is not None:
+            delta *= sample_weights[:, None]
+        delta /= batch_size
 
-        loss = predictions
-        loss[range(batch_size), labels] -= 1
-        loss /= batch_size
+        for i in range(len(self.layers) - 1, -1, -1):
+            delta = self.layers[i].backward(delta, propagate=i > 0)
 
-        gradients_weights_hidden_output = np.dot(hidden_layer_output.T, loss)
-        gradients_biases_output = np.sum(loss, axis=0)
+        self.optimizer.step(self._parameters(), self._gradients())
 
-        hidden_error = np.dot(loss, self.weights_output.T)
-        hidden_error *= super()._relu_activation(hidden_layer_input, True)
+    def _test_accuracy(self, batch_size: int = 4096) -> float:
+        if self.test_rows is None:
+            return super()._accuracy(self._forward_propagation(self.test_data), self.test_labels)
 
-        gradients_weights_input_hidden = np.dot(data.T, hidden_error)
-        gradients_biases_hidden = np.sum(hidden_error, axis=0)
+        correct = 0
+        for i in range(0, len(self.test_rows), batch_size):
+            rows = self.test_rows[i:i + batch_size]
+            predictions = self._forward_propagation(np.take(self.test_data, rows, axis=0))
+            correct += np.count_nonzero(np.argmax(predictions, axis=1) == self.test_labels[rows])
+        return correct / len(self.test_rows)
 
-        self.weights_hidden -= self.learning_rate * gradients_weights_input_hidden
-        self.bias_hidden -= self.learning_rate * gradients_biases_hidden
-        self.weights_output -= self.learning_rate * gradients_weights_hidden_output
-        self.bias_output -= self.learning_rate * gradients_biases_output
+    def _decode_races(self, indices: np.ndarray) -> np.ndarray:
+        if self.race_encoder is None:
+            return indices
+        return self.race_encoder.inverse_transform(indices)
 
     def _show_loss_conv(self):
+        import matplotlib.pyplot as plt
+
         indices = range(len(self.losses))
         plt.plot(indices, self.losses)
 
@@ -73,68 +150,244 @@ class MLPModel(BaseModel):
 
         plt.show()
 
-    def save_model(self, filename='mlp_model.pkl'):
+    def save_model(self, filename='mlp_model.pkl', layers: list | None = None):
+        if layers is None:
+            layers = [(layer.weights, layer.bias) for layer in self.layers]
         with open(filename, 'wb') as file:
             pickle.dump({
-                'weights_hidden': self.weights_hidden,
-                'bias_hidden': self.bias_hidden,
-                'weights_output': self.weights_output,
-                'bias_output': self.bias_output,
+                'hidden_sizes': self.hidden_sizes,
+                'layers': layers,
                 'best_accuracy': self.best_accuracy
             }, file)
         print(f"Model saved to {filename}")
 
+    def export_inference_model(self, label_encoders: EncodingSchema, filename='mlp_model.npz'):
+        arrays = {'feature_names': self.feature_names}
+        for i, layer in enumerate(self.layers):
+            arrays[f'weights_{i}'] = layer.weights
+            arrays[f'bias_{i}'] = layer.bias
+        arrays.update(label_encoders.to_arrays())
+        np.savez(filename, **arrays)
+        print(f"Inference model exported to {filename}")
+
     def load_model(self, filename='mlp_model.pkl'):
         with open(filename, 'rb') as file:
             model_data = pickle.load(file)
-            self.weights_hidden = model_data['weights_hidden']
-            self.bias_hidden = model_data['bias_hidden']
-            self.weights_output = model_data['weights_output']
-            self.bias_output = model_data['bias_output']
+            if 'layers' in model_data:
+                weights = model_data['layers']
+            else:
+                weights = [(model_data['weights_hidden'], model_data['bias_hidden']),
+                           (model_data['weights_output'], model_data['bias_output'])]
+
+            self.hidden_sizes = [layer_weights.shape[1] for layer_weights, _ in weights[:-1]]
+            self.hidden_size = self.hidden_sizes[0]
+            self.layers = self._build_layers()
+            for layer, (layer_weights, layer_bias) in zip(self.layers, weights):
+                layer.weights = layer_weights.astype(self.dtype)
+                layer.bias = layer_bias.astype(self.dtype)
+                layer.grad_weights = np.empty_like(layer.weights)
+                layer.grad_bias = np.empty_like(layer.bias)
             self.best_accuracy = model_data['best_accuracy']
         print(f"Model loaded from {filename}")
 
-    def train(self, batch_size: int = 100):
+    def save_checkpoint(self, label_encoders: EncodingSchema, filename='mlp_checkpoint.npz'):
+        optimizer = getattr(self, 'optimizer', None)
+        meta = {
+            'hidden_sizes': self.hidden_sizes,
+            'learning_rate': self.learning_rate,
+            'epochs': self.epochs,
+            'best_accuracy': float(self.best_accuracy),
+            'test_size': self.test_size,
+            'seed': str(self.seed),
+            'dtype': self.dtype.str,
+            'class_weights': self.class_weights,
+            'fill_values': self.fill_values,
+            'optimizer': None,
+        }
+        arrays = {
+            'feature_names': self.feature_names,
+            'train_data': self.train_data,
+            'test_data': self.test_data,
+            'train_labels': self.train_labels,
+            'test_labels': self.test_labels,
+        }
+        for i, layer in enumerate(self.layers):
+            arrays[f'weights_{i}'] = layer.weights
+            arrays[f'bias_{i}'] = layer.bias
+        arrays.update(label_encoders.to_arrays())
+
+        if optimizer is not None:
+            meta['optimizer'] = {'name': type(optimizer).__name__, 'config': optimizer.config(), 'state': {}}
+            for key, value in optimizer.state_dict().items():
+                if isinstance(value, list):
+                    meta['optimizer']['state'][key] = len(value)
+                    for i, array in enumerate(value):
+                        arrays[f'optimizer_{key}_{i}'] = array
+                else:
+                    meta['optimizer']['state'][key] = {'value': value}
+
+        np.savez(filename, meta=np.array(json.dumps(meta)), **arrays)
+        print(f"Checkpoint saved to {filename}")
+
+    @classmethod
+    def load_checkpoint(cls, filename='mlp_checkpoint.npz') -> tuple["MLPModel", EncodingSchema]:
+        with np.load(filename, allow_pickle=False) as checkpoint:
+            meta = json.loads(str(checkpoint['meta']))
+            arrays = {name: checkpoint[name] for name in checkpoint.files}
+
+        layers = sum(1 for name in arrays if name.startswith('weights_'))
+        output_size = arrays[f'weights_{layers - 1}'].shape[1]
+        encoders = EncodingSchema.from_arrays(arrays)
+
+        model = cls.from_split(arrays['train_data'], arrays['test_data'], arrays['train_labels'],
+                               arrays['test_labels'], output_size, meta['hidden_sizes'], meta['learning_rate'],
+                               meta['epochs'], encoders.get('Race'), np.dtype(meta['dtype']), int(meta['seed']),
+                               meta.get('class_weights'))
+        model.test_size = meta['test_size']
+        model.best_accuracy = meta['best_accuracy']
+        model.fill_values = meta.get('fill_values')
+        for i, layer in enumerate(model.layers):
+            layer.weights = arrays[f'weights_{i}']
+            layer.bias = arrays[f'bias_{i}']
+
+        if meta['optimizer'] is not None:
+            optimizer = OPTIMIZER_CLASSES[meta['optimizer']['name']](**meta['optimizer']['config'])
+            state = {}
+            for key, value in meta['optimizer']['state'].items():
+                if isinstance(value, dict):
+                    state[key] = value['value']
+                else:
+                    state[key] = [arrays[f'optimizer_{key}_{i}'] for i in range(value)]
+            optimizer.load_state_dict(state)
+            model.optimizer = optimizer
+
+        print(f"Checkpoint loaded from {filename}")
+        return model, encoders
+
+    def _expand_output(self, output_size: int):
+        layer = self.layers[-1]
+        extra = output_size - self.output_size
+        layer.weights = np.hstack([layer.weights, np.zeros((layer.weights.shape[0], extra), dtype=self.dtype)])
+        layer.bias = np.concatenate([layer.bias, np.full(extra, layer.bias.min(), dtype=self.dtype)])
+        layer.grad_weights = np.empty_like(layer.weights)
+        layer.grad_bias = np.empty_like(layer.bias)
+        layer.output = None
+        self.output_size = output_size
+        if getattr(self, 'optimizer', None) is not None:
+            self.optimizer.setup(self._parameters())
+
+    def fine_tune(self, df: pd.DataFrame, epochs: int = 5, batch_size: int = 50, save_path: str | None = None,
+                  verbose: bool = True):
+        """
+        Warm-starts from the current weights and optimizer state: the (already encoded) rows of `df` are split
+        with the model's test size, appended to the stored split, and training continues for `epochs`.
+        """
+        x = df.drop(columns=["Race"]).values.astype(self.dtype)
+        y = df["Race"].values.astype(self.train_labels.dtype)
+        if y.max() + 1 > self.output_size:
+            self._expand_output(int(y.max()) + 1)
+
+        order = self.rng.permutation(len(y))
+        test_count = int(round(len(y) * self.test_size))
+        test_rows, train_rows = order[:test_count], order[test_count:]
+        self.train_data = np.concatenate([self.train_data, x[train_rows]])
+        self.train_labels = np.concatenate([self.train_labels, y[train_rows]])
+        self.test_data = np.concatenate([self.test_data, x[test_rows]])
+        self.test_labels = np.concatenate([self.test_labels, y[test_rows]])
+
+        self.epochs = epochs
+        self.best_accuracy = self._test_accuracy()
+        return self.train(batch_size, getattr(self, 'optimizer', None), save_path=save_path, show_plot=False,
+                          verbose=verbose, resume=True)
+
+    def default_callbacks(self, save_path: str | None = None) -> list[Callback]:
+        callbacks = [ReduceLROnPlateau(self.offset, self.reduce)]
+        if save_path is not None:
+            callbacks.append(BestWeights(save_path))
+        return callbacks
+
+    def train(self, batch_size: int = 100, optimizer: Optimizer | None = None, save_path: str | None = 'mlp_model.pkl',
+              show_plot: bool = True, verbose: bool = True, resume: bool = False,
+              callbacks: list[Callback] | None = None, eval_every: int = 1):
+        """
+        `callbacks` defaults to reduce-on-plateau plus a best-weights snapshot flushed to `save_path` when training
+        ends. The test set is scored every `eval_every` epochs and on the last one.
+        """
         self.batch_size = batch_size
-        counter = 0
+        self.verbose = verbose
+        self.optimizer = optimizer if optimizer is not None else SGD(self.learning_rate)
+        self.learning_rate = self.optimizer.learning_rate
+        state = self.optimizer.state_dict().values()
+        if not (resume and any(isinstance(buffers, list) and buffers for buffers in state)):
+            self.optimizer.setup(self._parameters())
+        callbacks = self.default_callbacks(save_path) if callbacks is None else list(callbacks)
+        data_buffer = np.empty((batch_size, self.input_size), dtype=self.dtype)
+        train_count = self.train_data.shape[0] if self.train_rows is None else len(self.train_rows)
+        loss_weights, sample_probabilities = None, None
+        if self.class_weights is not None:
+            train_labels = self.train_labels if self.train_rows is None else self.train_labels[self.train_rows]
+            weights = self._class_weights(train_labels, self.output_size).astype(self.dtype)
+            if self.class_weights == 'loss':
+                loss_weights = weights
+            else:
+                sample_probabilities = weights[train_labels] / weights[train_labels].sum()
+        self.history = {'loss': [], 'accuracy': [], 'eval_epochs': []}
+        self.losses = self.history['loss']
+        self.accuracies = self.history['accuracy']
+        self.epochs_run = 0
+
+        for callback in callbacks:
+            callback.on_train_begin(self)
 
         for epoch in range(self.epochs):
-            self.train_data, self.train_labels = shuffle(self.train_data, self.train_labels)
+            self.epochs_run = epoch + 1
+            if sample_probabilities is None:
+                order = self.rng.permutation(train_count)
+            else:
+                order = self.rng.choice(train_count, train_count, p=sample_probabilities)
+            if self.train_rows is not None:
+                order = self.train_rows[order]
 
             epoch_loss = []
-            for i in range(0, self.train_data.shape[0], batch_size):
-                data_batch = self.train_data[i:i + batch_size]
-                labels_batch = self.train_labels[i:i + batch_size]
+            for i in range(0, train_count, batch_size):
+                indices = order[i:i + batch_size]
+                data_batch = np.take(self.train_data, indices, axis=0, out=data_buffer[:len(indices)])
+                labels_batch = self.train_labels[indices]
 
-                hidden_layer_input, hidden_layer_output, output_predictions = self._forward_propagation(data_batch)
-                loss = super()._cross_entropy_loss(output_predictions, labels_batch)
+                output_predictions = self._forward_propagation(data_batch)
+                loss = super()._cross_entropy_loss(output_predictions, labels_batch, loss_weights)
                 epoch_loss.append(loss)
 
-                self._backward_propagation(data_batch, labels_batch, hidden_layer_input, hidden_layer_output,
-                                           output_predictions)
+                sample_weights = None if loss_weights is None else loss_weights[labels_batch]
+                self._backward_propagation(labels_batch, output_predictions, sample_weights)
 
-            self.losses.append(np.array(epoch_loss).mean())
+            logs = {'epoch': epoch + 1, 'loss': np.array(epoch_loss).mean()}
+            self.history['loss'].append(logs['loss'])
 
-            predictions = self._forward_propagation(self.test_data)[-1]
-            accuracy = super()._accuracy(predictions, self.test_labels)
-            print(f'Epoch {epoch + 1}|{self.epochs}, Accuracy: {accuracy * 100:.2f}%')
+            if (epoch + 1) % eval_every == 0 or epoch + 1 == self.epochs:
+                accuracy = self._test_accuracy()
+                self.history['accuracy'].append(accuracy)
+                self.history['eval_epochs'].append(epoch + 1)
+                if verbose:
+                    print(f'Epoch {epoch + 1}|{self.epochs}, Accuracy: {accuracy * 100:.2f}%')
 
-            if accuracy > self.best_accuracy:
-                self.best_accuracy = accuracy
-                counter = 0
-                self.save_model()
-            else:
-                counter += 1
-                if counter == self.offset:
-                    self.learning_rate *= self.reduce
-                    print(f"Learning rate reduced to: {self.learning_rate}")
-                    counter = 0
-                    if self.learning_rate < 1e-3:
-                        print(f"Learning rate too low. Stopping...")
-                        break
+                logs['accuracy'] = accuracy
+                logs['improved'] = accuracy > self.best_accuracy
+                if logs['improved']:
+                    self.best_accuracy = accuracy
+
+            stop = False
+            for callback in callbacks:
+                stop = bool(callback.on_epoch_end(self, logs)) or stop
+            if stop:
+                break
+
+        for callback in callbacks:
+            callback.on_train_end(self)
 
-        predictions = self._forward_propagation(self.test_data)[-1]
+        accuracy = self._test_accuracy()
 
-        self._show_loss_conv()
+        if show_plot:
+            self._show_loss_conv()
 
-        return super()._accuracy(predictions, self.test_labels)
+        return accuracy
@@ -0,0 +1,118 @@
+import numpy as np
+
+
+class Optimizer:
+    """
+    Updates parameters in place from gradients (which may be overwritten). State buffers are allocated once in
+    `setup`, not per batch.
+    """
+
+    def __init__(self, learning_rate: float = 0.01):
+        self.learning_rate = learning_rate
+
+    def setup(self, params: list):
+        pass
+
+    def config(self) -> dict:
+        return {'learning_rate': self.learning_rate}
+
+    def step(self, params: list, grads: list):
+        raise NotImplementedError
+
+    def state_dict(self) -> dict:
+        return {}
+
+    def load_state_dict(self, state: dict):
+        pass
+
+
+class SGD(Optimizer):
+    def __init__(self, learning_rate: float = 0.01, momentum: float = 0.0):
+        super().__init__(learning_rate)
+        self.momentum = momentum
+        self.velocities = []
+
+    def config(self) -> dict:
+        return {'learning_rate': self.learning_rate, 'momentum': self.momentum}
+
+    def setup(self, params: list):
+        self.velocities = [np.zeros_like(param) for param in params] if self.momentum else []
+
+    def step(self, params: list, grads: list):
+        if not self.momentum:
+            for param, grad in zip(params, grads):
+                grad *= self.learning_rate
+                param -= grad
+            return
+
+        for param, grad, velocity in zip(params, grads, self.velocities):
+            velocity *= self.momentum
+            grad *= self.learning_rate
+            velocity -= grad
+            param += velocity
+
+    def state_dict(self) -> dict:
+        return {'velocities': self.velocities}
+
+    def load_state_dict(self, state: dict):
+        self.velocities = [np.array(velocity) for velocity in state.get('velocities', [])]
+
+
+class Adam(Optimizer):
+    def __init__(self, learning_rate: float = 0.001, beta1: float = 0.9, beta2: float = 0.999, epsilon: float = 1e-8):
+        super().__init__(learning_rate)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.steps = 0
+        self.first_moments = []
+        self.second_moments = []
+        self.buffers = []
+
+    def config(self) -> dict:
+        return {'learning_rate': self.learning_rate, 'beta1': self.beta1, 'beta2': self.beta2, 'epsilon': self.epsilon}
+
+    def setup(self, params: list):
+        self.steps = 0
+        self.first_moments = [np.zeros_like(param) for param in params]
+        self.second_moments = [np.zeros_like(param) for param in params]
+        self.buffers = [np.empty_like(param) for param in params]
+
+    def step(self, params: list, grads: list):
+        self.steps += 1
+        correction1 = 1 - self.beta1 ** self.steps
+        correction2 = 1 - self.beta2 ** self.steps
+        step_size = self.learning_rate * np.sqrt(correction2) / correction1
+
+        for param, grad, m, v, buffer in zip(params, grads, self.first_moments, self.second_moments, self.buffers):
+            m *= self.beta1
+            np.multiply(grad, 1 - self.beta1, out=buffer)
+            m += buffer
+            v *= self.beta2
+            np.square(grad, out=buffer)
+            buffer *= 1 - self.beta2
+            v += buffer
+
+            np.sqrt(v, out=buffer)
+            buffer += self.epsilon
+            np.divide(m, buffer, out=buffer)
+            buffer *= step_size
+            param -= buffer
+
+    def state_dict(self) -> dict:
+        return {'steps': self.steps, 'first_moments': self.first_moments, 'second_moments': self.second_moments}
+
+    def load_state_dict(self, state: dict):
+        self.steps = int(state.get('steps', 0))
+        self.first_moments = [np.array(m) for m in state.get('first_moments', [])]
+        self.second_moments = [np.array(v) for v in state.get('second_moments', [])]
+        self.buffers = [np.empty_like(m) for m in self.first_moments]
+
+
+OPTIMIZER_CLASSES = {'SGD': SGD, 'Adam': Adam}
+
+OPTIMIZERS = {
+    'sgd': SGD,
+    'momentum': lambda learning_rate: SGD(learning_rate, momentum=0.9),
+    'adam': Adam,
+}
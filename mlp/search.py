@@ -0,0 +1,137 @@
+import argparse
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from mlp.model import MLPModel
+from mlp.trials import share_arrays, attach_arrays, shared_array, release_arrays, model_kwargs, train_trial
+
+DEFAULT_SPACE = {
+    'hidden_size': [50, 100, 200, [128, 64]],
+    'learning_rate': [0.05, 0.1, 0.2],
+    'epochs': [50, 100],
+    'offset': [5, 10],
+    'reduce': [0.5, 0.8],
+}
+
+
+def _run_trial(config: dict, seed: int, batch_size: int, output_size: int) -> dict:
+    model = MLPModel.from_split(shared_array('train_data'), shared_array('test_data'), shared_array('train_labels'),
+                                shared_array('test_labels'), output_size, seed=seed, **model_kwargs(config))
+    return train_trial(model, config, seed, batch_size)
+
+
+def _run_trials(arrays: dict, configs: list[dict], seed: int, batch_size: int, workers: int | None) -> list[dict]:
+    output_size = int(max(arrays['train_labels'].max(), arrays['test_labels'].max())) + 1
+    blocks, specs = share_arrays(arrays)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=attach_arrays, initargs=(specs,)) as executor:
+            futures = [executor.submit(_run_trial, config, seed + i, batch_size, output_size)
+                       for i, config in enumerate(configs)]
+            results = [future.result() for future in futures]
+    finally:
+        release_arrays(blocks)
+    return sorted(results, key=lambda result: result['best_accuracy'], reverse=True)
+
+
+def grid_configs(space: dict) -> list[dict]:
+    keys = list(space.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+
+def random_configs(space: dict, trials: int, seed: int = 0) -> list[dict]:
+    """
+    Distinct configs drawn without replacement from the grid (at most the grid size), decoded from random grid
+    indices so the grid is never materialized.
+    """
+    rng = random.Random(seed)
+    keys = list(space.keys())
+    size = 1
+    for key in keys:
+        size *= len(space[key])
+
+    configs = []
+    for index in rng.sample(range(size), min(trials, size)):
+        config = {}
+        for key in reversed(keys):
+            index, position = divmod(index, len(space[key]))
+            config[key] = space[key][position]
+        configs.append({key: config[key] for key in keys})
+    return configs
+
+
+def grid_search(arrays: dict, space: dict = DEFAULT_SPACE, seed: int = 0, batch_size: int = 100,
+                workers: int | None = None) -> list[dict]:
+    return _run_trials(arrays, grid_configs(space), seed, batch_size, workers)
+
+
+def random_search(arrays: dict, space: dict = DEFAULT_SPACE, trials: int = 20, seed: int = 0, batch_size: int = 100,
+                  workers: int | None = None) -> list[dict]:
+    return _run_trials(arrays, random_configs(space, trials, seed), seed, batch_size, workers)
+
+
+def successive_halving(arrays: dict, space: dict = DEFAULT_SPACE, trials: int = 27, min_epochs: int = 10,
+                       eta: int = 3, seed: int = 0, batch_size: int = 100, workers: int | None = None) -> list[dict]:
+    """
+    Trains every candidate for `min_epochs`, keeps the best 1/eta and multiplies the budget by eta until one
+    candidate is left or the budget reaches the largest `epochs` in the space.
+    """
+    max_epochs = max(space.get('epochs', [min_epochs]))
+    candidates = random_configs({key: values for key, values in space.items() if key != 'epochs'}, trials, seed)
+    epochs = min_epochs
+    results = []
+
+    while candidates:
+        configs = [{**candidate, 'epochs': epochs} for candidate in candidates]
+        results = _run_trials(arrays, configs, seed, batch_size, workers)
+        if len(results) == 1 or epochs >= max_epochs:
+            break
+        candidates = [{key: value for key, value in result['config'].items() if key != 'epochs'}
+                      for result in results[:max(1, len(results) // eta)]]
+        epochs = min(epochs * eta, max_epochs)
+
+    return results
+
+
+def print_leaderboard(results: list[dict], top: int = 10):
+    print(f"{'#':>3} {'best acc':>9} {'final acc':>9} {'epochs':>6} {'time (s)':>9}  config")
+    for rank, result in enumerate(results[:top], start=1):
+        print(f"{rank:>3} {result['best_accuracy'] * 100:>8.2f}% {result['accuracy'] * 100:>8.2f}% "
+              f"{result['epochs_run']:>6} {result['train_time']:>9.2f}  {result['config']}")
+
+
+def load_arrays(use_smote: bool = True, seed: int = 0) -> dict:
+    from sklearn.model_selection import train_test_split
+    from engine.constants import DATASET_PATH
+    from engine.processing import process_dataset
+    from engine.utils import transform_non_numeric
+
+    df, _ = transform_non_numeric(process_dataset(DATASET_PATH, use_smote=use_smote, seed=seed))
+    x = df.drop(columns=["Race"]).values.astype(np.float64)
+    y = df["Race"].astype('category').cat.codes.values.astype(np.int64)
+    train_data, test_data, train_labels, test_labels = train_test_split(x, y, test_size=0.2, random_state=seed)
+    return {'train_data': train_data, 'test_data': test_data, 'train_labels': train_labels, 'test_labels': test_labels}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hyperparameter search over MLPModel configurations.")
+    parser.add_argument("--mode", choices=["grid", "random", "halving"], default="random")
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=100)
+
+    args = parser.parse_args()
+
+    data = load_arrays(seed=args.seed)
+    if args.mode == "grid":
+        leaderboard = grid_search(data, seed=args.seed, batch_size=args.batch_size, workers=args.workers)
+    elif args.mode == "random":
+        leaderboard = random_search(data, trials=args.trials, seed=args.seed, batch_size=args.batch_size,
+                                    workers=args.workers)
+    else:
+        leaderboard = successive_halving(data, trials=args.trials, seed=args.seed, batch_size=args.batch_size,
+                                         workers=args.workers)
+
+    print_leaderboard(leaderboard)
@@ -0,0 +1,63 @@
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from mlp.callbacks import ReduceLROnPlateau
+from mlp.model import MLPModel
+from mlp.optimizers import OPTIMIZERS
+
+_shared_arrays = {}
+
+
+def share_arrays(arrays: dict) -> tuple[list, dict]:
+    """
+    Copies `arrays` into shared memory once; pass the returned specs to `attach_arrays` in each worker and
+    `release_arrays(blocks)` when done.
+    """
+    blocks, specs = [], {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        blocks.append(block)
+        specs[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def attach_arrays(specs: dict):
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        _shared_arrays[name] = (block, array)
+
+
+def shared_array(name: str) -> np.ndarray:
+    return _shared_arrays[name][1]
+
+
+def release_arrays(blocks: list):
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+def model_kwargs(config: dict) -> dict:
+    return {'hidden_size': config['hidden_size'], 'learning_rate': config['learning_rate'],
+            'epochs': config['epochs'], 'class_weights': config.get('class_weights')}
+
+
+def train_trial(model: MLPModel, config: dict, seed: int, batch_size: int) -> dict:
+    callbacks = [ReduceLROnPlateau(config.get('offset', MLPModel.offset), config.get('reduce', MLPModel.reduce))]
+    optimizer = OPTIMIZERS[config.get('optimizer', 'sgd')](config['learning_rate'])
+
+    start = time.perf_counter()
+    accuracy = model.train(batch_size, optimizer, save_path=None, show_plot=False, verbose=False,
+                           callbacks=callbacks)
+    return {
+        'config': config,
+        'seed': seed,
+        'accuracy': accuracy,
+        'best_accuracy': model.best_accuracy,
+        'epochs_run': model.epochs_run,
+        'train_time': time.perf_counter() - start,
+    }
@@ -0,0 +1,182 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import numpy as np
+from mlp.inference import InferenceModel
+
+
+class MicroBatcher:
+    """
+    Collects rows from concurrent requests for up to `max_wait` seconds (or `max_batch` rows) and classifies
+    them with a single forward pass.
+    """
+
+    def __init__(self, model: InferenceModel, max_batch: int = 256, max_wait: float = 0.002):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+        self.batch_sizes = deque(maxlen=10000)
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, rows: np.ndarray) -> Future:
+        future = Future()
+        self.requests.put((rows, future))
+        return future
+
+    def _run(self):
+        while True:
+            pending = [self.requests.get()]
+            rows = len(pending[0][0])
+            deadline = time.perf_counter() + self.max_wait
+            while rows < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(self.requests.get(timeout=timeout))
+                except queue.Empty:
+                    break
+                rows += len(pending[-1][0])
+
+            try:
+                races = self.model.predict(np.vstack([request_rows for request_rows, _ in pending]))
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            self.batch_sizes.append(rows)
+            start = 0
+            for request_rows, future in pending:
+                future.set_result([str(race) for race in races[start:start + len(request_rows)]])
+                start += len(request_rows)
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 10000):
+        self.window = window
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float):
+        with self.lock:
+            self.samples.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+
+    def report(self) -> dict:
+        with self.lock:
+            snapshot = {endpoint: np.array(samples) for endpoint, samples in self.samples.items()}
+        return {
+            endpoint: {
+                'count': len(samples),
+                **{f'p{q}_ms': float(np.percentile(samples, q) * 1000) for q in (50, 90, 99)},
+            }
+            for endpoint, samples in snapshot.items()
+        }
+
+
+class CatologyServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, model: InferenceModel, max_batch: int = 256, max_wait: float = 0.002,
+                 backlog: int | None = None):
+        if backlog is not None:
+            self.request_queue_size = backlog
+        super().__init__(address, RequestHandler)
+        self.model = model
+        self.batcher = MicroBatcher(model, max_batch, max_wait)
+        self.latencies = LatencyTracker()
+        self.encoders = None
+
+    def classify_rows(self, rows) -> list[str]:
+        rows = self.model._to_matrix(rows)
+        if rows.ndim != 2 or rows.shape[1] != len(self.model.feature_names):
+            raise ValueError(f"expected rows of {len(self.model.feature_names)} attributes, got shape {rows.shape}")
+        return self.batcher.submit(rows).result()
+
+    def classify_text(self, text: str, translate: bool = False) -> dict:
+        from engine.text_processing import parse_english_sentence_to_cat_attributes, get_translator
+        from engine.utils import EncodingSchema
+
+        if self.encoders is None:
+            self.encoders = EncodingSchema.from_classes(self.model.classes)
+        if translate:
+            text = get_translator().translate(text)
+        attributes = parse_english_sentence_to_cat_attributes(
+            text,
+            color_encoder=self.encoders.get('Color'),
+            pattern_encoder=self.encoders.get('Pattern'),
+            zone_encoder=self.encoders.get('Zone')
+        )
+        return {'text': text, 'attributes': attributes, 'race': self.classify_rows([attributes])[0]}
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    server: CatologyServer
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self._send(200, {'latency': self.server.latencies.report(),
+                             'mean_batch_size': float(np.mean(self.server.batcher.batch_sizes or [0]))})
+        elif self.path == '/health':
+            self._send(200, {'status': 'ok'})
+        else:
+            self._send(404, {'error': f'unknown endpoint {self.path}'})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            if self.path == '/classify/attributes':
+                attributes = request['attributes']
+                races = self.server.classify_rows(attributes if isinstance(attributes, list) else [attributes])
+                response = {'races': races}
+            elif self.path == '/classify/text':
+                response = self.server.classify_text(request['text'], request.get('translate', False))
+            else:
+                self._send(404, {'error': f'unknown endpoint {self.path}'})
+                return
+        except (KeyError, ValueError, TypeError) as e:
+            self._send(400, {'error': str(e)})
+            return
+        except Exception as e:
+            self._send(500, {'error': f'{type(e).__name__}: {e}'})
+            return
+
+        self._send(200, response)
+        self.server.latencies.record(self.path, time.perf_counter() - start)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Long-running Catology inference server.")
+    parser.add_argument("--model", default="mlp_model.npz", help="Inference artifact from export_inference_model")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--backlog", type=int, default=CatologyServer.request_queue_size,
+                        help="Pending connections the listening socket queues before refusing new ones")
+
+    args = parser.parse_args()
+
+    server = CatologyServer((args.host, args.port), InferenceModel.load(args.model), args.max_batch,
+                            args.max_wait_ms / 1000, args.backlog)
+    print(f"Serving on http://{args.host}:{args.port} (POST /classify/attributes, /classify/text; GET /stats)")
+    server.serve_forever()